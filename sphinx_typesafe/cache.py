@@ -0,0 +1,106 @@
+###################################################################################
+#
+# Least recently used cache of results of decorated functions.
+#
+# Author: Richard Gomes<rgomes.info@gmail.com>
+# See: CHANGES.rst for full list of modifications
+# Hosted on Github:  https://github.com/frgomes/sphinx_typesafe
+#
+###################################################################################
+
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import collections
+import threading
+
+
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses maxsize currsize')
+
+
+# Fields of links of the circular list, from least to most recently used
+_PREV, _NEXT, _KEY, _RESULT = 0, 1, 2, 3
+
+
+class LRUCache(object):
+    '''Remembers results of a decorated function, by arguments already checked.
+
+    No more than ``maxsize`` results are kept; the least recently used one is
+    discarded first. Entries are kept in a dictionary of links of a circular list,
+    like ``functools.lru_cache`` does, so that a hit costs a lookup and a few
+    assignments. Statistics are not synchronized, hence they may be approximate
+    under threads.
+
+    Keys which cannot be hashed, like arguments of hashable types holding unhashable
+    values, such as ``([ 1 ], )``, are never remembered: looking them up counts as a miss.
+
+    Employed by functions decorated with ``@typesafe(cache=maxsize)``.
+    '''
+
+    __slots__ = ('maxsize', 'hits', 'misses', 'entries', 'root', 'lock')
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits    = 0
+        self.misses  = 0
+        self.entries = dict()  # key -> link
+        self.root    = list()  # link which is neither least nor most recently used
+        self.root[:] = [ self.root, self.root, None, None ]
+        self.lock    = threading.Lock()
+
+    def get(self, key, default):
+        '''Returns the result remembered for ``key``, or ``default``.'''
+        with self.lock:
+            try:
+                link = self.entries.get(key)
+            except TypeError:
+                # unhashable key
+                link = None
+            if link is not None:
+                # moves the link to the most recently used position
+                prev, next = link[_PREV], link[_NEXT]
+                prev[_NEXT] = next
+                next[_PREV] = prev
+                root = self.root
+                last = root[_PREV]
+                last[_NEXT] = root[_PREV] = link
+                link[_PREV] = last
+                link[_NEXT] = root
+                result = link[_RESULT]
+        if link is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return result
+
+    def put(self, key, result):
+        with self.lock:
+            try:
+                if key in self.entries:
+                    # computed meanwhile by another thread
+                    return
+            except TypeError:
+                # unhashable key
+                return
+            root = self.root
+            if len(self.entries) >= self.maxsize:
+                # the oldest link becomes the new root, holding nothing
+                oldest = root
+                oldest[_KEY], oldest[_RESULT] = key, result
+                root = self.root = oldest[_NEXT]
+                del self.entries[root[_KEY]]
+                root[_KEY] = root[_RESULT] = None
+                self.entries[key] = oldest
+            else:
+                last = root[_PREV]
+                link = [ last, root, key, result ]
+                last[_NEXT] = root[_PREV] = self.entries[key] = link
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.root[:] = [ self.root, self.root, None, None ]
+            self.hits = self.misses = 0
@@ -0,0 +1,240 @@
+###################################################################################
+#
+# Offline verification of @typesafe specifications.
+#
+# Author: Richard Gomes<rgomes.info@gmail.com>
+# See: CHANGES.rst for full list of modifications
+# Hosted on Github:  https://github.com/frgomes/sphinx_typesafe
+#
+# Usage:
+#
+#     $ python -m sphinx_typesafe check [--jobs N] [--cache FILE] <paths>
+#
+###################################################################################
+
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import ast
+import os
+
+from sphinx_typesafe.typesafe import get_class_type, parse_docstring
+
+
+DEFAULT_CACHE = '.typesafe-cache'
+
+
+def find_sources(paths):
+    """Yield all Python source files found under ``paths``, sorted per directory."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith('.py'):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def _decorator_name(node):
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _arg_name(node):
+    # Python2 represents arguments as ast.Name, Python3 as ast.arg
+    return getattr(node, 'arg', None) or node.id
+
+
+def _typesafe_functions(tree):
+    """Yield ``(node, ismethod)`` for every function decorated with @typesafe."""
+    def visit(parent):
+        for node in ast.iter_child_nodes(parent):
+            if isinstance(node, ast.FunctionDef):
+                names = [ _decorator_name(d) for d in node.decorator_list ]
+                if 'typesafe' in names:
+                    yield node, isinstance(parent, ast.ClassDef) and 'staticmethod' not in names
+            for item in visit(node):
+                yield item
+    return visit(tree)
+
+
+def _entries(node):
+    """Obtain the specification of a function node, either from decorator
+    arguments or from its docstring, using the same grammar as @typesafe.
+    """
+    for d in node.decorator_list:
+        if isinstance(d, ast.Call) and _decorator_name(d) == 'typesafe' and d.args:
+            if len(d.args) != 1:
+                raise AttributeError('@typesafe: illegal number of parameters')
+            try:
+                spec = ast.literal_eval(d.args[0])
+            except ValueError:
+                raise AttributeError('@typesafe: specification must be a literal dictionary')
+            if not isinstance(spec, dict):
+                raise AttributeError('@typesafe: parameter must be a dictionary')
+            return [ (k.strip(), v) for k, v in spec.items() ]
+    return parse_docstring(ast.get_docstring(node))
+
+
+def _inherits(node, entries, params):
+    """Tells whether a method inherits the specification of the method it overrides,
+    either explicitly, by means of ``inherit=True``, or for lack of any specification.
+    """
+    for d in node.decorator_list:
+        if isinstance(d, ast.Call) and _decorator_name(d) == 'typesafe':
+            for keyword in d.keywords:
+                if keyword.arg == 'inherit':
+                    return bool(ast.literal_eval(keyword.value))
+            if d.args:
+                return False
+    return params and list(entries) == [ ('return', 'types.NoneType') ]
+
+
+def check_function(node, ismethod):
+    """Cross-check the specification of a function node against its signature.
+
+    Returns a list of problems, each one as a human readable message.
+    """
+    import types
+    problems = list()
+    try:
+        entries = _entries(node)
+    except AttributeError as e:
+        return [ '{}'.format(e) ]
+
+    params = [ _arg_name(a) for a in node.args.args ]
+    if ismethod: params = params[1:]
+    if ismethod and _inherits(node, entries, params):
+        # the specification of the overridden method is only known at runtime
+        return problems
+    names = [ name for name, t in entries ]
+
+    resolved = dict()
+    for name, t in entries:
+        try:
+            resolved[name] = get_class_type(t)
+        except Exception as e:
+            problems.append('cannot resolve type "{}" of "{}": {}'.format(t, name, e))
+
+    missing = [ name for name in params if name not in names ]
+    if missing:
+        problems.append('missing argument(s) expected: "{}"'.format(missing))
+    variadic = [ node.args.vararg, node.args.kwarg ]
+    variadic = [ getattr(a, 'arg', a) for a in variadic if a is not None ]
+    extra = [ name for name in names if name not in params and name not in variadic and name != 'return' ]
+    if extra:
+        problems.append('extra specification(s) detected: "{}"'.format(extra))
+
+    defaults = node.args.defaults
+    for name, default in zip(params[len(params) - len(defaults):], defaults):
+        if name not in resolved or resolved[name] is types.NotImplementedType:
+            continue
+        try:
+            value = ast.literal_eval(default)
+        except ValueError:
+            continue
+        if not isinstance(value, resolved[name]):
+            problems.append('Wrong type for default of {}: expected: {}, actual: {}.'.format(
+                name, resolved[name], type(value)))
+    return problems
+
+
+def check_file(path):
+    """Verify all @typesafe specifications found in a source file.
+
+    Returns a tuple ``(path, problems)``, where problems are formatted as
+    ``path:line: function: message``.
+    """
+    try:
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+    except (IOError, SyntaxError) as e:
+        return path, [ '{}:0: {}'.format(path, e) ]
+    problems = list()
+    for node, ismethod in _typesafe_functions(tree):
+        for problem in check_function(node, ismethod):
+            problems.append('{}:{}: {}: {}'.format(path, node.lineno, node.name, problem))
+    return path, problems
+
+
+def _load_cache(filename):
+    import json
+    try:
+        with open(filename) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return dict()
+
+
+def _save_cache(filename, cache):
+    import json
+    with open(filename, 'w') as f:
+        json.dump(cache, f, indent=1, sort_keys=True)
+
+
+def check_paths(paths, jobs=None, cache=None):
+    """Verify all source files under ``paths`` employing a pool of ``jobs`` processes.
+
+    When ``cache`` names a file, results are kept there and only files which
+    changed since the previous run are checked again.
+
+    Returns a list of problems, sorted by file.
+    """
+    files = [ os.path.abspath(p) for p in find_sources(paths) ]
+    state = _load_cache(cache) if cache else dict()
+
+    def stamp(path):
+        st = os.stat(path)
+        return [ st.st_mtime, st.st_size ]
+
+    stamps = dict( (path, stamp(path)) for path in files )
+    pending = [ path for path in files
+                if path not in state or state[path]['stamp'] != stamps[path] ]
+
+    if jobs == 1 or len(pending) < 2:
+        results = [ check_file(path) for path in pending ]
+    else:
+        import multiprocessing
+        pool = multiprocessing.Pool(jobs)
+        try:
+            results = pool.map(check_file, pending, chunksize=max(1, len(pending) // (4 * (jobs or 4))))
+        finally:
+            pool.close()
+            pool.join()
+
+    for path, problems in results:
+        state[path] = { 'stamp': stamps[path], 'problems': problems }
+    if cache:
+        _save_cache(cache, dict( (path, state[path]) for path in files ))
+    return [ problem for path in sorted(files) for problem in state[path]['problems'] ]
+
+
+def main(argv=None):
+    import argparse
+    import sys
+    parser = argparse.ArgumentParser(prog='python -m sphinx_typesafe')
+    commands = parser.add_subparsers(dest='command')
+    check = commands.add_parser('check', help='verify @typesafe specifications without running code')
+    check.add_argument('paths', nargs='+', help='source files or directories')
+    check.add_argument('-j', '--jobs', type=int, default=None,
+                       help='number of worker processes (default: number of CPUs)')
+    check.add_argument('--cache', default=DEFAULT_CACHE,
+                       help='file where results are kept between runs (default: %(default)s)')
+    check.add_argument('--no-cache', dest='cache', action='store_const', const=None,
+                       help='check all files, ignoring previous results')
+    args = parser.parse_args(argv)
+
+    # resolve type names relative to the current directory, like the interpreter does
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    problems = check_paths(args.paths, jobs=args.jobs, cache=args.cache)
+    for problem in problems:
+        print(problem)
+    return 1 if problems else 0
@@ -0,0 +1,122 @@
+###################################################################################
+#
+# Identity cache, which avoids verifying the same containers over and over again.
+#
+# Author: Richard Gomes<rgomes.info@gmail.com>
+# See: CHANGES.rst for full list of modifications
+# Hosted on Github:  https://github.com/frgomes/sphinx_typesafe
+#
+###################################################################################
+
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import collections
+import threading
+import weakref
+
+
+class IdentityCache(object):
+    '''Remembers containers which already satisfied a certain specification.
+
+    Verifying a container, like ``list of Point``, costs time proportional to
+    its length. This cache remembers, by identity, containers which satisfied
+    their specifications, so that passing them again costs O(1). Only
+    containers which cannot change are remembered: immutable ones, like
+    ``tuple of int``, and ones explicitly frozen by means of ``freeze``.
+
+    Objects are held by weak references, so that entries are discarded as soon
+    as objects die. Objects which do not support weak references, like tuples
+    and lists, are held by strong references instead, which guarantees that
+    their identities are not reused. No more than ``size`` objects are
+    remembered; older entries are discarded first.
+
+    The cache is opt-in: it is employed by functions decorated with
+    ``@typesafe(identity_cache=True)``.
+    '''
+
+    def __init__(self, size=1024):
+        self.size    = size
+        self.entries = collections.OrderedDict()  # id -> (holder, checks)
+        self.frozen  = dict()                     # id -> holder
+        # reentrant, since dropping an entry may kill an object whose weak reference
+        # calls back ``discard`` whilst the lock is held
+        self.lock    = threading.RLock()
+
+    def remember(self, check):
+        '''Wraps a predicate of a container type, so that it employs this cache.'''
+        entries = self.entries
+        immutable = check.immutable
+
+        def cached(obj):
+            entry = entries.get(id(obj))
+            if entry is not None and check in entry[1] and entry[0]() is obj:
+                return True
+            if not check(obj):
+                return False
+            if immutable or self.isfrozen(obj):
+                self.add(obj, check)
+            return True
+        return cached
+
+    def holder(self, obj):
+        key = id(obj)
+        try:
+            return weakref.ref(obj, lambda ref: self.discard(key, ref))
+        except TypeError:
+            return lambda: obj
+
+    def add(self, obj, check):
+        key = id(obj)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0]() is obj:
+                entry[1].add(check)
+            else:
+                if len(self.entries) >= self.size:
+                    self.entries.popitem(last=False)
+                self.entries[key] = (self.holder(obj), set([ check ]))
+
+    def discard(self, key, holder):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] is holder:
+                del self.entries[key]
+            if self.frozen.get(key) is holder:
+                del self.frozen[key]
+
+    def freeze(self, obj):
+        '''Promises that a mutable container will not change anymore, so that it
+        can be remembered once it satisfies a specification. Returns ``obj``.
+
+        Objects which do not support weak references are kept alive until ``thaw``.
+        '''
+        with self.lock:
+            self.frozen[id(obj)] = self.holder(obj)
+        return obj
+
+    def thaw(self, obj):
+        '''Cancels ``freeze``, so that ``obj`` is verified again on every call. Returns ``obj``.'''
+        key = id(obj)
+        with self.lock:
+            holder = self.frozen.get(key)
+            if holder is not None and holder() is obj:
+                del self.frozen[key]
+            entry = self.entries.get(key)
+            if entry is not None and entry[0]() is obj:
+                del self.entries[key]
+        return obj
+
+    def isfrozen(self, obj):
+        holder = self.frozen.get(id(obj))
+        return holder is not None and holder() is obj
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.frozen.clear()
+
+
+identity = IdentityCache()
+freeze   = identity.freeze
+thaw     = identity.thaw
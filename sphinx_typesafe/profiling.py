@@ -0,0 +1,136 @@
+###################################################################################
+#
+# Profiling of types actually passed to and returned by decorated functions.
+#
+# Author: Richard Gomes<rgomes.info@gmail.com>
+# See: CHANGES.rst for full list of modifications
+# Hosted on Github:  https://github.com/frgomes/sphinx_typesafe
+#
+###################################################################################
+
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import collections
+
+
+_containers = (list, tuple, set, frozenset, dict)
+
+try:
+    _itervalues = dict.itervalues
+except AttributeError:
+    _itervalues = dict.values  # a view, in Python 3
+
+
+def type_name(t):
+    '''Returns the name of type ``t`` as employed in specifications.'''
+    if t is type(None): return 'types.NoneType'
+    module = getattr(t, '__module__', None)
+    if module in ('__builtin__', 'builtins'): return t.__name__
+    return '{}.{}'.format(module, t.__name__)
+
+
+def common_base(types):
+    '''Returns the most specific class which all ``types`` extend, other than ``object``, or None.'''
+    import inspect
+    candidates = [ t for t in inspect.getmro(types[0]) if t is not object ]
+    for t in candidates:
+        if all( issubclass(other, t) for other in types[1:] ):
+            return t
+    return None
+
+
+class TypeProfile(object):
+    '''Records histograms of types of arguments and results of decorated functions,
+    in order to suggest specifications.
+
+    For each parameter, no more than ``limit`` distinct types are counted; further
+    ones are counted together as others. Containers are described by the type of
+    their first element only, so that recording costs the same regardless of length.
+    Counts are not synchronized, hence they may be approximate under threads.
+
+    Install by means of ``typesafe.observe``.
+    '''
+
+    def __init__(self, limit=8):
+        self.limit     = limit
+        self.functions = collections.OrderedDict()  # function -> parameter -> key -> count
+
+    def observe(self, function, arguments, result):
+        parameters = self.functions.get(function)
+        if parameters is None:
+            parameters = self.functions.setdefault(function, collections.OrderedDict())
+        for name, value in arguments:
+            self.count(parameters, name, value)
+        self.count(parameters, 'return', result)
+
+    def count(self, parameters, name, value):
+        histogram = parameters.get(name)
+        if histogram is None:
+            histogram = parameters.setdefault(name, dict())
+        key = type(value)
+        if key in _containers:
+            # the first element tells the type of elements, without copying values
+            elements = _itervalues(value) if isinstance(value, dict) else value
+            key = (key, type(next(iter(elements))) if value else None)
+        if key not in histogram and len(histogram) >= self.limit:
+            key = None
+        histogram[key] = histogram.get(key, 0) + 1
+
+    def histogram(self, function, parameter):
+        '''Returns ``(type name, count)`` pairs observed for a parameter, most frequent first.'''
+        histogram = self.functions.get(function, {}).get(parameter, {})
+        names = [ (self.describe(key), count) for key, count in histogram.items() ]
+        return sorted(names, key=lambda item: (-item[1], item[0]))
+
+    def describe(self, key):
+        if key is None: return '(others)'
+        if isinstance(key, tuple):
+            container, element = key
+            return type_name(container) if element is None else \
+                '{} of {}'.format(type_name(container), type_name(element))
+        return type_name(key)
+
+    def suggest(self, function, parameter):
+        '''Returns a type name which accepts all values observed for a parameter, or None.'''
+        histogram = self.functions.get(function, {}).get(parameter, {})
+        if not histogram or None in histogram: return None
+        keys = list(histogram)
+        containers = set( key[0] for key in keys if isinstance(key, tuple) )
+        if all( isinstance(key, tuple) for key in keys ) and len(containers) == 1:
+            # containers of the same kind: empty ones accept any element type
+            elements = [ key[1] for key in keys if key[1] is not None ]
+            container = type_name(keys[0][0])
+            if not elements: return container
+            base = common_base(elements)
+            return '{} of {}'.format(container, type_name(base)) if base else container
+        base = common_base([ key[0] if isinstance(key, tuple) else key for key in keys ])
+        return type_name(base) if base else None
+
+    def suggestions(self, function):
+        '''Returns lines of a Sphinx docstring specifying the types observed for ``function``.
+
+        Parameters which cannot be specified by a single type are given as comments,
+        together with the types observed.
+        '''
+        lines = list()
+        parameters = self.functions.get(function, {})
+        for parameter in sorted(parameters, key=lambda parameter: parameter == 'return'):
+            field = ':rtype:' if parameter == 'return' else ':type {}:'.format(parameter)
+            suggestion = self.suggest(function, parameter)
+            if suggestion is not None:
+                lines.append('{} {}'.format(field, suggestion))
+            else:
+                lines.append('# {} ?  observed: {}'.format(field, ', '.join(
+                    [ '{} ({})'.format(name, count) for name, count in self.histogram(function, parameter) ])))
+        return lines
+
+    def report(self, file=None):
+        '''Prints suggested specifications of all functions observed.'''
+        import sys
+        file = file or sys.stdout
+        for function in self.functions:
+            f = function.f
+            print('{}.{}:'.format(getattr(f, '__module__', '?'), f.__name__), file=file)
+            for line in self.suggestions(function):
+                print('    {}'.format(line), file=file)
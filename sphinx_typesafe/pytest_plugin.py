@@ -0,0 +1,100 @@
+###################################################################################
+#
+# pytest plugin which reports the overhead of @typesafe and untested specifications.
+#
+# Author: Richard Gomes<rgomes.info@gmail.com>
+# See: CHANGES.rst for full list of modifications
+# Hosted on Github:  https://github.com/frgomes/sphinx_typesafe
+#
+###################################################################################
+
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import collections
+
+import pytest
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('typesafe')
+    group.addoption('--typesafe-overhead', action='store_true', default=False,
+                    help='report time spent in checks of @typesafe, per test and per '
+                         'decorated function, and decorated functions never called.')
+    group.addoption('--typesafe-top', action='store', type=int, default=10, metavar='N',
+                    help='number of tests and functions reported by --typesafe-overhead.')
+
+
+def pytest_configure(config):
+    if config.getoption('typesafe_overhead'):
+        config.pluginmanager.register(Overhead(config.getoption('typesafe_top')), 'typesafe-overhead')
+
+
+def name(function):
+    '''Returns the qualified name of a decorated function.'''
+    f = function.f
+    return '{}.{}'.format(getattr(f, '__module__', '?'), f.__name__)
+
+
+class Profiler(object):
+    '''Accumulates time spent in checks and in bodies of decorated functions,
+    by test and by function. See: ``typesafe.profile``.
+    '''
+
+    def __init__(self):
+        import timeit
+        self.clock     = timeit.default_timer
+        self.test      = None
+        self.tests     = collections.defaultdict(lambda: [ 0, 0.0, 0.0 ])  # test -> [ calls, checks, body ]
+        self.functions = collections.defaultdict(lambda: [ 0, 0.0, 0.0 ])  # name -> [ calls, checks, body ]
+
+    def record(self, function, checks, body):
+        for key, table in ((self.test, self.tests), (name(function), self.functions)):
+            entry = table[key]
+            entry[0] += 1
+            entry[1] += checks
+            entry[2] += body
+
+
+class Overhead(object):
+    '''Times checks of decorated functions whilst tests run and reports the tests
+    and the functions which spend most time in checks.
+    '''
+
+    def __init__(self, top):
+        self.top = top
+        self.profiler = Profiler()
+
+    def pytest_sessionstart(self, session):
+        from sphinx_typesafe.typesafe import typesafe
+        typesafe.profile(self.profiler)
+
+    def pytest_sessionfinish(self, session):
+        from sphinx_typesafe.typesafe import typesafe
+        typesafe.profile(None)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        self.profiler.test = item.nodeid
+        try:
+            yield
+        finally:
+            self.profiler.test = None
+
+    def pytest_terminal_summary(self, terminalreporter):
+        from sphinx_typesafe.typesafe import typesafe
+        tr = terminalreporter
+        header = '{:>8} {:>12} {:>12} {:>8}  {}'
+        line   = '{:>8} {:>12.6f} {:>12.6f} {:>7.1f}%  {}'
+        for title, table in (('tests', self.profiler.tests), ('functions', self.profiler.functions)):
+            tr.write_sep('-', 'typesafe overhead: {} spending most time in checks'.format(title))
+            tr.write_line(header.format('calls', 'checks (s)', 'body (s)', 'checks', title[:-1]))
+            entries = sorted(table.items(), key=lambda item: -item[1][1])
+            for key, (calls, checks, body) in entries[:self.top]:
+                share = 100.0 * checks / (checks + body) if checks + body else 0.0
+                tr.write_line(line.format(calls, checks, body, share, key if key is not None else '(outside tests)'))
+        called = set(self.profiler.functions)
+        never = sorted(set( name(function) for function in typesafe.registered() ) - called)
+        tr.write_sep('-', 'typesafe overhead: {} decorated functions never called'.format(len(never)))
+        for key in never:
+            tr.write_line(key)
@@ -0,0 +1,217 @@
+###################################################################################
+#
+# Reporting and recording of type violations found by @typesafe.
+#
+# Author: Richard Gomes<rgomes.info@gmail.com>
+# See: CHANGES.rst for full list of modifications
+# Hosted on Github:  https://github.com/frgomes/sphinx_typesafe
+#
+###################################################################################
+
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import atexit
+import collections
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+
+
+class Reporter(object):
+    '''Logs type violations from a background thread.
+
+    Decorated functions only append violations to a queue, which is cheap and
+    does not require locks, since ``deque.append`` is atomic. A background
+    thread wakes up every ``interval`` seconds and drains the queue.
+
+    Violations are aggregated by ``(function, parameter, actual type)``, so that
+    each one is logged at most once per interval, together with the number of
+    occurrences. No more than ``limit`` records are logged per interval; the
+    remaining ones are logged later. No more than ``capacity`` violations are
+    kept waiting in the queue; further ones are only counted as dropped.
+
+    A process forked from another one starts its own thread, since threads are not
+    inherited. At exit, the thread is stopped and violations still queued are logged.
+    '''
+
+    def __init__(self, interval=1.0, limit=10, capacity=10000, logger='sphinx_typesafe'):
+        self.interval = interval
+        self.limit    = limit
+        self.capacity = capacity
+        self.logger   = logging.getLogger(logger)
+        self.queue    = collections.deque()
+        self.dropped  = 0
+        self.counts   = collections.Counter()   # total occurrences, by key
+        self.pending  = collections.OrderedDict()  # occurrences not logged yet, by key
+        self.lock     = threading.Lock()
+        self.wakeup   = threading.Event()
+        self.thread   = None
+        self.pid      = None   # process which started the thread
+        self.stopping = False
+
+    def report(self, function, violations):
+        '''Called by decorated functions for each call which violates its specification.'''
+        if len(self.queue) < self.capacity:
+            self.queue.append( (function, violations) )
+        else:
+            self.dropped += 1
+        if self.pid != os.getpid():
+            self.start()
+
+    def start(self):
+        pid = os.getpid()
+        if self.pid is not None and self.pid != pid:
+            # forked: threads which held these in the parent do not exist here
+            self.lock   = threading.Lock()
+            self.wakeup = threading.Event()
+        with self.lock:
+            if self.pid != pid:
+                if self.pid is None:
+                    atexit.register(self.stop)
+                thread = threading.Thread(target=self.run, name='sphinx_typesafe.reporter')
+                thread.daemon = True
+                thread.start()
+                self.thread, self.pid = thread, pid
+
+    def stop(self):
+        '''Stops the background thread and logs violations still queued. Called at exit.'''
+        thread = self.thread
+        if thread is None or self.pid != os.getpid():
+            return
+        self.stopping = True
+        self.wakeup.set()
+        thread.join()
+        self.flush()
+
+    def run(self):
+        while not self.stopping:
+            self.wakeup.wait(self.interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        '''Drains the queue and logs aggregated violations, respecting the rate limit.'''
+        with self.lock:
+            queue = self.queue
+            while queue:
+                function, violations = queue.popleft()
+                for parameter, expected, actual in violations:
+                    key = (function, parameter, expected, actual)
+                    self.counts[key] += 1
+                    self.pending[key] = self.pending.get(key, 0) + 1
+            dropped, self.dropped = self.dropped, 0
+            for i in range(min(self.limit, len(self.pending))):
+                (function, parameter, expected, actual), count = self.pending.popitem(last=False)
+                self.logger.warning(
+                    '%s: Wrong type for %s: expected: %s, actual: %s. (%d times, %d in total)',
+                    function, parameter, expected, actual, count,
+                    self.counts[(function, parameter, expected, actual)])
+            if dropped:
+                self.logger.warning('%d type violations were dropped', dropped)
+
+    def statistics(self):
+        '''Returns the total number of occurrences of each violation reported so far,
+        by ``(function, parameter, expected, actual)``.
+        '''
+        self.flush()
+        with self.lock:
+            return dict(self.counts)
+
+    def reset(self):
+        with self.lock:
+            self.queue.clear()
+            self.dropped = 0
+            self.counts.clear()
+            self.pending.clear()
+
+
+reporter = Reporter()
+
+
+class Violation(collections.namedtuple('Violation', 'sequence time function violations arguments location thread')):
+    '''A violation recorded by ``RingBuffer``.
+
+    ``violations`` is a list of ``(parameter, expected, actual)`` tuples, ``arguments``
+    is a tuple of ``(name, type, repr)`` tuples and ``location`` is a tuple
+    ``(filename, line, function)`` describing the caller of the decorated function.
+    '''
+    __slots__ = ()
+
+
+class RingBuffer(object):
+    '''Keeps the last ``size`` violations, for post-mortem inspection.
+
+    Slots are preallocated, so that memory stays constant regardless of how many
+    violations happen. Violations are only recorded when found, so that calls which
+    satisfy their specifications do not pay anything.
+
+    Recording finds the caller and represents all arguments, which costs more than
+    raising ``TypeCheckError``. Decorated functions only record violations into
+    ``recent`` whilst its attribute ``enabled`` is True, which is not the default.
+    '''
+
+    # frames belonging to these modules are skipped when looking for the caller
+    internal = ('sphinx_typesafe.typesafe', 'sphinx_typesafe.reporting')
+
+    def __init__(self, size=100, maxrepr=80, enabled=True):
+        try:
+            from repr import Repr
+        except ImportError:
+            from reprlib import Repr
+        self.enabled = enabled
+        self.size    = size
+        self.slots   = [ None ] * size
+        self.counter = itertools.count()
+        self.repr    = Repr()
+        self.repr.maxstring = self.repr.maxother = maxrepr
+
+    def record(self, function, violations, arguments):
+        '''Records a violation, given ``arguments`` as ``(name, value)`` pairs.'''
+        frame = sys._getframe(1)
+        while frame is not None and frame.f_globals.get('__name__') in self.internal:
+            frame = frame.f_back
+        location = (frame.f_code.co_filename, frame.f_lineno, frame.f_code.co_name) if frame else None
+        arguments = tuple( (name, type(value), self.repr.repr(value)) for name, value in arguments )
+        # itertools.count is atomic, so that concurrent threads employ distinct slots
+        sequence = next(self.counter)
+        self.slots[sequence % self.size] = Violation(
+            sequence, time.time(), function, violations, arguments, location,
+            threading.current_thread().name)
+
+    def entries(self, function=None, parameter=None):
+        '''Returns recorded violations, oldest first, optionally filtered by
+        function name and by parameter name.
+        '''
+        result = sorted([ entry for entry in self.slots if entry is not None ],
+                        key=lambda entry: entry.sequence)
+        if function is not None:
+            result = [ entry for entry in result if entry.function == function ]
+        if parameter is not None:
+            result = [ entry for entry in result
+                       if parameter in [ v[0] for v in entry.violations ] ]
+        return result
+
+    def clear(self):
+        self.slots[:] = [ None ] * self.size
+
+    def dump(self, filename):
+        '''Writes recorded violations onto a file, one JSON object per line.'''
+        import json
+        with open(filename, 'w') as f:
+            for entry in self.entries():
+                f.write(json.dumps({
+                    'time':       entry.time,
+                    'function':   entry.function,
+                    'violations': [ [ p, '{}'.format(e), '{}'.format(a) ] for p, e, a in entry.violations ],
+                    'arguments':  [ [ n, '{}'.format(t), r ] for n, t, r in entry.arguments ],
+                    'location':   entry.location,
+                    'thread':     entry.thread,
+                    }, sort_keys=True))
+                f.write('\n')
+
+
+recent = RingBuffer(enabled=False)
@@ -0,0 +1,310 @@
+###################################################################################
+#
+# Rewriting of decorated functions at import time, so that checks are inlined.
+#
+# Author: Richard Gomes<rgomes.info@gmail.com>
+# See: CHANGES.rst for full list of modifications
+# Hosted on Github:  https://github.com/frgomes/sphinx_typesafe
+#
+###################################################################################
+
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import ast
+import imp
+import sys
+
+
+# Guards placed at the top of rewritten functions and before their returns
+_guard  = 'if not isinstance({0}, {1}): _typesafe_fail({2!r}, {3!r}, {0}, {1})'
+_result = str('_typesafe_result')  # identifiers of the AST are not unicode
+
+# Decorators which may be kept together with a rewritten @typesafe
+_binders = ('staticmethod', 'classmethod')
+
+
+def fail(function, name, obj, cls):
+    """Called by a guard whose ``isinstance`` failed. Reports the violation exactly like
+    ``@typesafe`` would, unless classes are accepted as subclasses of ``cls`` or checks
+    are bypassed, see: ``typesafe.disabled`` and ``typesafe.configure(trusted=...)``.
+    """
+    from sphinx_typesafe import typesafe as ts
+    v = ts.violation(name, obj, cls)
+    if v is None: return
+    if ts._slowpath:
+        # frames: this function, the rewritten function, its caller
+        level = ts._scope.get()
+        if level is not None:
+            if level == 'off': return
+        elif ts._defaults['trusted'] and ts._trusted_module(sys._getframe(2).f_globals.get('__name__')):
+            return
+    ts._fail(function, None, [ v ], [ (name, obj) ])
+
+
+class Unresolved(object):
+    """Placeholder of a type in the globals of a rewritten module, which resolves the type
+    name on first ``isinstance`` and replaces itself by the actual type, so that type names
+    may refer to classes defined later, like ``@typesafe`` allows.
+    """
+
+    __slots__ = ('namespace', 'key', 'spec')
+
+    def __init__(self, namespace, key, spec):
+        self.namespace = namespace  # globals of the module
+        self.key       = key        # name of the global variable holding the type
+        self.spec      = spec       # type name, not resolved yet
+
+    def __instancecheck__(self, obj):
+        from sphinx_typesafe.typesafe import get_class_type
+        import types
+        cls = get_class_type(self.spec)
+        if cls == types.NotImplementedType: cls = object
+        self.namespace[self.key] = cls
+        return isinstance(obj, cls)
+
+
+class Rewriter(ast.NodeTransformer):
+    """Removes ``@typesafe`` from functions specified by their docstrings and inserts
+    ``isinstance`` guards of arguments at the top of their bodies and of results before
+    each ``return``, so that calls do not pay for a wrapper.
+
+    Only the bare decorator is rewritten. Functions whose decorator has arguments, which
+    are generators, which accept ``*args`` or ``**kwargs``, which inherit specifications,
+    which employ type variables, or whose specifications do not match their signatures
+    keep being decorated.
+
+    Types are held by global variables of the module, see: ``types``.
+    """
+
+    def __init__(self):
+        self.types = list()  # (global variable, type name)
+        self.classes = 0     # depth of class bodies enclosing the current function
+
+    def visit_ClassDef(self, node):
+        self.classes += 1
+        try:
+            self.generic_visit(node)
+        finally:
+            self.classes -= 1
+        return node
+
+    def visit_FunctionDef(self, node):
+        classes, self.classes = self.classes, 0
+        try:
+            self.generic_visit(node)
+        finally:
+            self.classes = classes
+        decorator = self.decorator(node)
+        method = classes > 0 and not any( _name(d) == 'staticmethod' for d in node.decorator_list )
+        spec = self.specification(node, method) if decorator is not None else None
+        if spec is None: return node
+        names, rtype = spec
+        body = list(node.body)
+        doc = [ body.pop(0) ] if ast.get_docstring(node) is not None else []
+        guards = list()
+        for name, t in names:
+            guards.extend(self.guard(node, name, name, t))
+        if rtype is not None:
+            var = self.variable(rtype)
+            body = [ _Returns(self, node, var).visit(statement) for statement in body ]
+            body = [ s for statement in body for s in (statement if isinstance(statement, list) else [ statement ]) ]
+            if not body or not isinstance(body[-1], (ast.Return, ast.Raise)):
+                body.extend(self.returns(node, var, ast.Name(id=str('None'), ctx=ast.Load())))
+        node.body = doc + guards + (body or [ ast.Pass() ])
+        node.decorator_list.remove(decorator)
+        return node
+
+    def decorator(self, node):
+        """Returns the bare ``@typesafe`` decorating ``node``, if it can be removed, or None."""
+        found = [ d for d in node.decorator_list if _name(d) == 'typesafe' ]
+        if len(found) != 1: return None
+        others = [ d for d in node.decorator_list if d is not found[0] ]
+        if node.decorator_list[-1] is not found[0] and any( _name(d) not in _binders for d in others ):
+            # other decorators would receive a wrapper, not the function
+            return None
+        return found[0]
+
+    def specification(self, node, method):
+        """Returns ``(names, rtype)``, where ``names`` are ``(parameter, type name)`` pairs
+        to be guarded, or None when ``node`` is to be left decorated.
+        """
+        from sphinx_typesafe.typesafe import parse_fields, _typevar_re
+        args = node.args
+        if args.vararg or args.kwarg: return None
+        params = [ _name(a) for a in args.args ]
+        if None in params: return None
+        if any( isinstance(child, ast.Yield) for child in _body(node) ): return None
+        fields = parse_fields(ast.get_docstring(node))
+        if not fields.types and fields.rtype is None: return None
+        # type variables are bound per call, which guards cannot do
+        if any( _typevar_re.search(t) for t in [ t for name, t in fields.types ] + [ fields.rtype or '' ] ):
+            return None
+        types = dict(fields.types)
+        if len(types) != len(fields.types) or any( name not in params for name in types ): return None
+        # the receiver of a method is not specified
+        required = params[1:] if method and params and params[0] not in types else params
+        if any( name not in types for name in required ): return None
+        ignored = 'types.NotImplementedType'
+        names = [ (name, types[name]) for name in required if types[name] != ignored ]
+        rtype = fields.rtype or 'types.NoneType'
+        return names, (rtype if rtype != ignored else None)
+
+    def variable(self, spec):
+        """Returns the name of a new global variable which will hold the type named ``spec``."""
+        var = '_typesafe_type{}'.format(len(self.types))
+        self.types.append( (var, ' '.join(spec.split())) )
+        return var
+
+    def guard(self, node, name, value, spec, var=None):
+        var = var or self.variable(spec)
+        return _locate(ast.parse(_guard.format(value, var, str(node.name), str(name))).body, node)
+
+    def returns(self, node, var, value):
+        """Returns statements which check ``value`` and return it."""
+        assign = ast.Assign(targets=[ ast.Name(id=_result, ctx=ast.Store()) ], value=value)
+        statements = [ assign ] + self.guard(node, 'return', _result, None, var) + \
+                     [ ast.Return(value=ast.Name(id=_result, ctx=ast.Load())) ]
+        return _locate(statements, value if hasattr(value, 'lineno') else node)
+
+    def namespace(self, namespace):
+        """Installs into ``namespace``, the globals of the module, what guards need."""
+        namespace['_typesafe_fail'] = fail
+        for var, spec in self.types:
+            namespace[var] = Unresolved(namespace, var, spec)
+        return namespace
+
+
+class _Returns(ast.NodeTransformer):
+    """Replaces ``return`` statements of a function, not of nested ones, by checked ones."""
+
+    def __init__(self, rewriter, node, var):
+        self.rewriter = rewriter
+        self.node     = node
+        self.var      = var
+
+    def visit_Return(self, node):
+        value = node.value if node.value is not None else ast.Name(id=str('None'), ctx=ast.Load())
+        return _locate(self.rewriter.returns(self.node, self.var, value), node)
+
+    def visit_FunctionDef(self, node):
+        return node
+
+    def visit_ClassDef(self, node):
+        return node
+
+    def visit_Lambda(self, node):
+        return node
+
+
+def _name(node):
+    """Returns the name of a decorator or of a parameter, or None."""
+    if isinstance(node, ast.Name): return node.id
+    if isinstance(node, ast.Attribute): return node.attr
+    return getattr(node, 'arg', None)
+
+
+def _locate(statements, node):
+    """Places ``statements`` at the line of ``node``, so that tracebacks point at it."""
+    for statement in statements:
+        for child in ast.walk(statement):
+            if 'lineno' in child._attributes:
+                child.lineno, child.col_offset = node.lineno, node.col_offset
+    return statements
+
+
+def _body(node):
+    """Yields nodes of the body of a function, not of nested functions, classes or lambdas."""
+    pending = list(node.body)
+    while pending:
+        child = pending.pop()
+        yield child
+        if not isinstance(child, (ast.FunctionDef, ast.ClassDef, ast.Lambda)):
+            pending.extend(ast.iter_child_nodes(child))
+
+
+def compile_source(source, filename='<string>'):
+    """Rewrites decorated functions of a module and compiles it.
+
+    Returns ``(code, rewriter)``; call ``rewriter.namespace(globals)`` before executing ``code``.
+    """
+    tree = ast.parse(source, filename)
+    rewriter = Rewriter()
+    tree = ast.fix_missing_locations(rewriter.visit(tree))
+    return compile(tree, filename, 'exec', 0, True), rewriter
+
+
+class Importer(object):
+    """Finder and loader of modules of certain packages, which rewrites decorated
+    functions whilst modules are imported. See: ``install``.
+    """
+
+    def __init__(self, packages):
+        self.packages = tuple(packages)
+
+    def find_module(self, fullname, path=None):
+        # modules are not imported here, since imports would come back to this method
+        if not any( fullname == p or fullname.startswith(p + '.') for p in self.packages ):
+            return None
+        try:
+            file, filename, (suffix, mode, kind) = imp.find_module(fullname.rpartition('.')[2], path)
+        except ImportError:
+            return None
+        if file is not None: file.close()
+        # packages and compiled modules are imported as usual
+        return _Loader(filename) if kind == imp.PY_SOURCE else None
+
+
+class _Loader(object):
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def load_module(self, fullname):
+        if fullname in sys.modules: return sys.modules[fullname]
+        with open(self.filename, 'rb') as file:
+            source = file.read()
+        code, rewriter = compile_source(source, self.filename)
+        module = imp.new_module(fullname)
+        module.__file__    = self.filename
+        module.__loader__  = self
+        module.__package__ = str(fullname.rpartition('.')[0]) or None
+        rewriter.namespace(module.__dict__)
+        sys.modules[fullname] = module
+        try:
+            exec(code, module.__dict__)
+        except:
+            del sys.modules[fullname]
+            raise
+        return module
+
+
+_importer = None
+
+
+def install(packages):
+    """Rewrites functions decorated by the bare ``@typesafe`` in modules of ``packages``
+    imported from now on: the decorator is removed and ``isinstance`` guards are inserted
+    into their bodies, so that calls cost like hand-written guards.
+
+    Violations are reported like ``@typesafe`` reports them, with the same messages.
+    Rewritten functions are not registered, timed nor observed, and missing or unexpected
+    arguments raise ``TypeError``, like undecorated functions do.
+
+    :param packages: names of packages, or modules, to be rewritten.
+    """
+    global _importer
+    if isinstance(packages, (str, unicode)):
+        raise AttributeError('@typesafe: packages must be a list of package names')
+    uninstall()
+    _importer = Importer(packages)
+    sys.meta_path.insert(0, _importer)
+    return _importer
+
+
+def uninstall():
+    """Stops rewriting modules imported from now on. Modules already imported are kept."""
+    global _importer
+    if _importer in sys.meta_path:
+        sys.meta_path.remove(_importer)
+    _importer = None
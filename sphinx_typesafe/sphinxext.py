@@ -0,0 +1,166 @@
+###################################################################################
+#
+# Sphinx extension which renders specifications of decorated functions as
+# resolved, cross-referenced types, reusing specifications parsed at runtime.
+#
+# Author: Richard Gomes<rgomes.info@gmail.com>
+# See: CHANGES.rst for full list of modifications
+# Hosted on Github:  https://github.com/frgomes/sphinx_typesafe
+#
+###################################################################################
+
+from __future__ import unicode_literals
+from __future__ import print_function
+
+import inspect
+import re
+
+from sphinx_typesafe.typesafe import typesafe, get_class_type, parse_fields, TypeVar
+
+
+# a field which specifies a type: ``:type x: T``, ``:vartype x: T`` or ``:rtype: T``
+_field_re = re.compile(r"^([\s]*:(?:(type|vartype)[\s]+(\w+)|rtype)[\s]*:[\s]*)(.*)$", re.IGNORECASE)
+_callable_re = re.compile(r"^callable[\s]*(?:\(([^)]*)\)(?:[\s]*->[\s]*(.+))?)?$")
+
+# rendered types, by type name: ``(text, error)``, so that names are resolved once
+_rendered = dict()
+
+
+def setup(app):
+    '''Entry point of the extension, listed in ``extensions`` of ``conf.py``.'''
+    import sphinx_typesafe
+    app.setup_extension('sphinx.ext.autodoc')
+    app.add_config_value('typesafe_strict', True, 'env')
+    app.add_autodocumenter(documenter())
+    app.connect('autodoc-process-docstring', process_docstring)
+    return { 'version': sphinx_typesafe.__version__, 'parallel_read_safe': True }
+
+
+def documenter():
+    '''Returns an autodoc documenter of decorated functions, which documents the
+    signature and the docstring of the function which is decorated.
+    '''
+    from sphinx.ext.autodoc import FunctionDocumenter, ModuleDocumenter
+
+    class TypesafeDocumenter(FunctionDocumenter):
+        objtype       = 'typesafe'
+        directivetype = 'function'
+        priority      = FunctionDocumenter.priority + 1
+
+        @classmethod
+        def can_document_member(cls, member, membername, isattr, parent):
+            return (isinstance(parent, ModuleDocumenter) and
+                    typesafe.unwrap(member) is not member and inspect.isfunction(typesafe.unwrap(member)))
+
+        def import_object(self, *args, **kwargs):
+            found = FunctionDocumenter.import_object(self, *args, **kwargs)
+            if found:
+                self.object = typesafe.unwrap(self.object)
+            return found
+
+    return TypesafeDocumenter
+
+
+def process_docstring(app, what, name, obj, options, lines):
+    '''Handler of ``autodoc-process-docstring``: renders types of ``lines`` and fails
+    the build when a type name cannot be resolved, unless ``typesafe_strict = False``.
+    '''
+    errors = render_docstring(obj, lines)
+    if not errors:
+        return
+    message = '{}: {}'.format(name, '; '.join(errors))
+    if app.config.typesafe_strict:
+        from sphinx.errors import ExtensionError
+        raise ExtensionError(message)
+    from sphinx.util import logging
+    logging.getLogger(__name__).warning(message)
+
+
+def render_docstring(obj, lines):
+    '''Renders types specified by ``:type:``, ``:vartype:`` and ``:rtype:`` fields of
+    ``lines`` as cross-references of resolved types, in place.
+
+    The specification of ``obj`` is looked up by its docstring amongst specifications
+    already parsed at runtime, hence docstrings of decorated functions and classes are
+    not parsed again. Fields are rendered only when they match the specification.
+
+    Returns a list of messages of type names which could not be resolved.
+    '''
+    doc = inspect.getdoc(typesafe.unwrap(obj))
+    if not doc:
+        return []
+    fields = parse_fields(doc)
+    specs  = dict()  # (field, name) -> type name
+    specs.update( (('type',    name), t) for name, t in fields.types )
+    specs.update( (('vartype', name), t) for name, t in fields.vartypes )
+    if fields.rtype is not None:
+        specs[('rtype', None)] = fields.rtype
+    errors = list()
+    for t in specs.values():
+        text, error = render(t)
+        if error is not None and error not in errors:
+            errors.append(error)
+    i = 0
+    while i < len(lines):
+        found = _field_re.match(lines[i])
+        if found is None:
+            i += 1
+            continue
+        head, kind, name, t = found.groups()
+        # types may continue on following lines
+        end = i + 1
+        while end < len(lines) and lines[end].strip() and not lines[end].lstrip().startswith(':'):
+            t += ' ' + lines[end]
+            end += 1
+        t = ' '.join(t.split())
+        if specs.get(((kind or 'rtype').lower(), name)) == t:
+            lines[i:end] = [ head + render(t)[0] ]
+        i += 1
+    return errors
+
+
+def render(t):
+    '''Returns ``(text, error)``, where ``text`` renders type name ``t`` in reStructuredText
+    by means of cross-references and ``error`` describes why ``t`` could not be resolved,
+    or is None.
+    '''
+    rendered = _rendered.get(t)
+    if rendered is None:
+        rendered = _rendered.setdefault(t, _render(t))
+    return rendered
+
+
+def _render(t):
+    found = _callable_re.match(t)
+    if found is not None:
+        params, result = found.groups()
+        if params is None:
+            return ':func:`callable`', None
+        parts = [ render(p.strip()) for p in params.split(',') if p.strip() ]
+        text = ':func:`callable`\\ ({})'.format(', '.join( text for text, error in parts ))
+        if result:
+            parts.append(render(result.strip()))
+            text += ' -> ' + parts[-1][0]
+        return text, next(( error for text, error in parts if error is not None ), None)
+    container, of, element = t.partition(' of ')
+    if of:
+        parts = [ render(container), render(element) ]
+        return ' of '.join( text for text, error in parts ), parts[0][1] or parts[1][1]
+    try:
+        resolved = get_class_type(t)
+    except Exception as e:
+        return '``{}``'.format(t), 'cannot resolve type {}: {}'.format(t, e)
+    if isinstance(resolved, TypeVar):
+        if resolved.bound is None:
+            return '*{}*'.format(resolved.name), None
+        bound = render(t.partition('<=')[2].strip())
+        return '*{}* <= {}'.format(resolved.name, bound[0]), bound[1]
+    if resolved is type(None):
+        return ':obj:`None`', None
+    role = 'func' if inspect.isfunction(resolved) else 'class'
+    module = getattr(resolved, '__module__', None)
+    target = resolved.__name__ if module in (None, '__builtin__', 'builtins') else '{}.{}'.format(
+        module, resolved.__name__)
+    if target == t:
+        return ':{}:`{}`'.format(role, target), None
+    return ':{}:`{} <{}>`'.format(role, t, target), None
@@ -0,0 +1,117 @@
+#######################################################
+#                                                     #
+# Micro benchmarks of the overhead of @typesafe.      #
+#                                                     #
+# Usage: python -m sphinx_typesafe.tests.benchmarks   #
+#                                                     #
+#######################################################
+
+
+from sphinx_typesafe.typesafe import typesafe
+
+
+def plain(a, b, c, x=0, y=0.0, z=''):
+    return a
+
+
+@typesafe
+def checked(a, b, c, x=0, y=0.0, z=''):
+    """
+    :type a: int
+    :type b: float
+    :type c: str
+    :type x: int
+    :type y: float
+    :type z: str
+    :rtype:  int
+    """
+    return a
+
+
+def rewrite(function):
+    """Returns ``function`` rewritten by ``sphinx_typesafe.rewrite``, with checks inlined."""
+    import inspect
+    from sphinx_typesafe.rewrite import compile_source
+    code, rewriter = compile_source(inspect.getsource(function.f))
+    namespace = rewriter.namespace({ 'typesafe': typesafe })
+    exec(code, namespace)
+    return namespace[function.f.__name__]
+
+
+inlined = rewrite(checked)
+
+
+calls = [
+    ('positional', 'f(1, 2.0, "c", 1, 2.0, "z")'),
+    ('keyword',    'f(a=1, b=2.0, c="c", x=1, y=2.0, z="z")'),
+    ('mixed',      'f(1, 2.0, "c", z="z", y=2.0)'),
+    ('defaults',   'f(1, 2.0, "c")'),
+    ]
+
+
+def run(calls, functions=('plain', 'checked'), number=100000, repeat=3):
+    """Prints time per call, in microseconds, of undecorated and decorated functions."""
+    import timeit
+    print('{:<12} {:>10} {:>10} {:>8}'.format('call', functions[0], functions[1], 'ratio'))
+    for label, stmt in calls:
+        times = list()
+        for name in functions:
+            timer = timeit.Timer(stmt, 'from {} import {} as f'.format(__name__, name))
+            times.append(min(timer.repeat(repeat, number)) * 1e6 / number)
+        print('{:<12} {:>10.3f} {:>10.3f} {:>8.1f}'.format(label, times[0], times[1], times[1] / times[0]))
+
+
+# A large docstring, in the style of real world libraries
+docstring = """Sends a request and returns its response.
+
+This function prepares a request, sends it over a pooled connection and returns
+the response received. Redirects are followed, unless told otherwise.
+
+""" + "".join([ """:param p{0}: parameter number {0}, which is described in detail here, since
+    real world descriptions often span a couple of lines.
+:type p{0}: list of
+    int
+:param str q{0}: inline parameter number {0}
+""".format(i) for i in range(20) ]) + """:raises ValueError: when the request is malformed
+:returns: the response received
+:rtype: dict of str
+"""
+
+
+def legacy(doc):
+    """Parses a docstring like previous versions did, by means of two regular expressions."""
+    import re
+    _type = r"[\w\.]+(?:[\s]+of[\s]+[\w\.]+)*"
+    _callable = r"callable[\s]*\([^)\n]*\)(?:[\s]*->[\s]*" + _type + ")?"
+    types_re = re.compile(r":type[\s]+(\w+)[\s]*:[\s]*(" + _callable + "|" + _type + ")", re.IGNORECASE)
+    rtype_re = re.compile(r":rtype[\s]*:[\s]*(" + _callable + "|" + _type + ")", re.IGNORECASE)
+    entries = types_re.findall(doc)
+    m = rtype_re.search(doc)
+    entries.append( ('return', m.group(1) if m else 'types.NoneType') )
+    return entries
+
+
+def run_parsers(number=2000, repeat=3):
+    """Prints time per docstring parsed, in microseconds, by the regular expressions
+    of previous versions and by ``_parse_fields``, which actually parses, and time per
+    docstring found amongst the ones already parsed by ``parse_docstring``.
+
+    Regular expressions are compiled once and cached by module ``re``, like before.
+    """
+    import timeit
+    print('{:<12} {:>10} {:>10} {:>8} {:>10}'.format('docstring', 'legacy', 'fields', 'ratio', 'shared'))
+    times = list()
+    for stmt in ('legacy(doc)', '_parse_fields(doc)', 'parse_docstring(doc)'):
+        timer = timeit.Timer(stmt, 'from {} import legacy, docstring as doc; '
+                                   'from sphinx_typesafe.typesafe import _parse_fields, parse_docstring'.format(__name__))
+        times.append(min(timer.repeat(repeat, number)) * 1e6 / number)
+    print('{:<12} {:>10.3f} {:>10.3f} {:>8.1f} {:>10.3f}'.format(
+        '{} lines'.format(len(docstring.splitlines())), times[0], times[1], times[1] / times[0], times[2]))
+
+
+if __name__ == "__main__":
+    run(calls)
+    print('')
+    run(calls, ('plain', 'inlined'))
+    print('')
+    run_parsers()
@@ -47,10 +47,7 @@ class Circle(Point):
 
     @typesafe
     def distance(self, p):
-        """Calculates the distance to a Point p.
-
-        :type p: sphinx_typesafe.tests.geometry.Point
-        :rtype:  float
+        """Calculates the distance to a Point p, inheriting the specification of Point.distance.
         """
         return super(Circle,self).distance(p) - self.r
 
@@ -0,0 +1,90 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+@typesafe
+class ClassA(object):
+    """
+    :ivar x: abscissa
+    :vartype x: float
+    :ivar y: ordinate
+    :vartype y: float
+    """
+    __slots__ = ('x', 'y', 'z')
+
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+
+
+@typesafe({ 'points': 'list of float', 'name': 'str' })
+class ClassB(object):
+    name = 'unnamed'
+
+
+def test_attributes_01a():
+    import pytest
+    a = ClassA(1.0, 2.0)
+    assert((a.x, a.y) == (1.0, 2.0))
+    with pytest.raises(TypeCheckError) as e:
+        a.x = 'a'
+    assert(e.value.function == 'ClassA')
+    assert(e.value.parameter == 'x')
+    assert(a.x == 1.0)
+    with pytest.raises(TypeCheckError):
+        ClassA(1.0, 2)
+    # attributes without specification are not affected
+    a.z = 'z'
+    assert(a.z == 'z')
+    # instances still have no __dict__
+    assert(not hasattr(a, '__dict__'))
+
+
+def test_attributes_01b():
+    import pytest
+    a = ClassA(1.0, 2.0)
+    del a.x
+    with pytest.raises(AttributeError):
+        a.x
+    a.x = 3.0
+    assert(a.x == 3.0)
+
+
+def test_attributes_02a():
+    import pytest
+    b = ClassB()
+    # class attributes become defaults
+    assert(b.name == 'unnamed')
+    with pytest.raises(AttributeError):
+        b.points
+    b.points = [ 1.0, 2.0 ]
+    b.name = 'b'
+    assert((b.points, b.name) == ([ 1.0, 2.0 ], 'b'))
+    with pytest.raises(TypeCheckError) as e:
+        b.points = [ 1.0, 'a' ]
+    assert(e.value.parameter == 'points')
+    # class attributes are still found in the class, whilst descriptors are in __dict__
+    assert(ClassB.name == 'unnamed')
+    assert(ClassB.__dict__['name'].spec == 'str')
+    assert(ClassB.points.spec == 'list of float')
+
+
+def test_attributes_02b():
+    from sphinx_typesafe.reporting import reporter
+
+    @typesafe(mode='warn')
+    class ClassC(object):
+        """
+        :vartype n: int
+        """
+    reporter.reset()
+    c = ClassC()
+    c.n = 'a'
+    assert(c.n == 'a')
+    assert(reporter.statistics() == { ('ClassC', 'n', int, str): 1 })
+
+
+def test_attributes_03a():
+    import pytest
+    with pytest.raises(AttributeError):
+        @typesafe([ 'x' ])
+        class ClassD(object):
+            pass
@@ -0,0 +1,57 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+@typesafe
+def function_f1(a):
+    """
+    :type a: int
+    :rtype:  int
+    """
+    return a
+
+
+class ClassA(object):
+    @typesafe({ 'a': 'int', 'return': 'int' })
+    def method_a1(self, a):
+        return a
+
+
+def untrusted(source):
+    """Runs ``source`` from a module which is not trusted."""
+    import types
+    module = types.ModuleType(str('untrusted'))
+    module.__dict__.update(function_f1=function_f1, ClassA=ClassA)
+    exec(source, module.__dict__)
+    return module
+
+
+def test_boundary_01a():
+    import pytest
+    try:
+        typesafe.configure(trusted=[ 'sphinx_typesafe.tests' ])
+        # internal calls are not checked
+        assert(function_f1('a') == 'a')
+        assert(ClassA().method_a1('a') == 'a')
+        # calls from elsewhere are checked
+        with pytest.raises(TypeCheckError):
+            untrusted('function_f1("a")')
+        with pytest.raises(TypeCheckError):
+            untrusted('ClassA().method_a1("a")')
+        assert(untrusted('result = function_f1(1)').result == 1)
+    finally:
+        typesafe.configure(trusted=[])
+    with pytest.raises(TypeCheckError):
+        function_f1('a')
+
+
+def test_boundary_01b():
+    import pytest
+    try:
+        # packages match whole module names only
+        typesafe.configure(trusted=[ 'sphinx_typesafe.te' ])
+        with pytest.raises(TypeCheckError):
+            function_f1('a')
+    finally:
+        typesafe.configure(trusted=[])
+    with pytest.raises(AttributeError):
+        typesafe.configure(trusted='sphinx_typesafe')
@@ -0,0 +1,150 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+calls = list()
+
+
+@typesafe(cache=3)
+def power(base, exponent=2):
+    """
+    :type base:     int
+    :type exponent: int
+    :rtype: int
+    """
+    calls.append( (base, exponent) )
+    return base ** exponent
+
+
+@typesafe(cache=100)
+def fibonacci(n):
+    """
+    :type n: int
+    :rtype: int
+    """
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+class Circle(object):
+
+    def __init__(self, radius):
+        self.radius = radius
+
+    @typesafe(cache=10)
+    @classmethod
+    def unit(cls, factor):
+        """
+        :type factor: float
+        :rtype: float
+        """
+        calls.append(factor)
+        return factor
+
+
+@typesafe(cache=10)
+def length(a):
+    """
+    :type a: tuple
+    :rtype: int
+    """
+    calls.append(a)
+    return len(a)
+
+
+def test_cache_01a():
+    import pytest
+    power.cache_clear()
+    del calls[:]
+    assert(power(2) == 4)
+    # equivalent calls are keyed alike
+    assert(power(2, 2) == 4)
+    assert(power(base=2) == 4)
+    assert(power(exponent=2, base=2) == 4)
+    assert(calls == [ (2, 2) ])
+    assert(power.cache_info() == (3, 1, 3, 1))
+    # arguments are checked on every call
+    with pytest.raises(TypeCheckError):
+        power('a')
+    with pytest.raises(TypeCheckError):
+        power(2, exponent=2.0)
+    assert(power.cache_info().hits == 3)
+
+
+def test_cache_01b():
+    power.cache_clear()
+    del calls[:]
+    for base in [ 1, 2, 3, 1, 4, 2 ]:
+        power(base)
+    # least recently used results are discarded first
+    assert(calls == [ (1, 2), (2, 2), (3, 2), (4, 2), (2, 2) ])
+    assert(power.cache_info() == (1, 5, 3, 3))
+    power.cache_clear()
+    assert(power.cache_info() == (0, 0, 3, 0))
+
+
+def test_cache_01c():
+    assert(fibonacci(80) == 23416728348467685)
+    assert(fibonacci.cache_info().misses == 81)
+
+
+def test_cache_01d():
+    import pytest
+    del calls[:]
+    assert([ Circle.unit(2.0), Circle(1.0).unit(2.0) ] == [ 2.0, 2.0 ])
+    assert(calls == [ 2.0 ])
+    assert(Circle.__dict__['unit'].cache_info().hits == 1)
+    # instances would be kept alive by the cache and their state ignored: instance
+    # methods are rejected at decoration
+    with pytest.raises(AttributeError) as e:
+        class Square(object):
+            @typesafe(cache=10)
+            def scaled(self, factor):
+                """
+                :type factor: float
+                """
+                pass
+    assert('instance methods' in str(e.value))
+
+
+def test_cache_01e():
+    length.cache_clear()
+    del calls[:]
+    # values of hashable types may hold unhashable values: they are not remembered
+    assert(length(( [ 1 ], )) == 1)
+    assert(length(( [ 1 ], )) == 1)
+    assert(length(( 1, )) == 1)
+    assert(length(( 1, )) == 1)
+    assert(calls == [ ( [ 1 ], ), ( [ 1 ], ), ( 1, ) ])
+    assert(length.cache_info() == (1, 3, 10, 1))
+
+
+def test_cache_02a():
+    import pytest
+
+    # unhashable arguments are rejected at decoration
+    with pytest.raises(AttributeError) as e:
+        @typesafe(cache=10)
+        def some_function(a, b, *args, **kwargs):
+            """
+            :type a: int
+            :type b: list of int
+            :type args: tuple of int
+            :type kwargs: dict of set
+            """
+            pass
+    assert('hashable' in str(e.value) and "['b', 'kwargs']" in str(e.value))
+    with pytest.raises(AttributeError):
+        @typesafe(cache=0)
+        def other_function(a):
+            """
+            :type a: int
+            """
+            pass
+
+    @typesafe(collect=True)
+    def third_function(a):
+        """
+        :type a: int
+        """
+        pass
+    with pytest.raises(AttributeError):
+        third_function.cache_info()
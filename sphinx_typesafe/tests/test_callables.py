@@ -0,0 +1,106 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+@typesafe
+def function_f1(f, x):
+    """
+    :type f: callable(int) -> str
+    :type x: int
+    :rtype:  str
+    """
+    return f(x)
+
+
+@typesafe(wrap_callables=True)
+def function_f2(f, x):
+    """
+    :type f: callable(int) -> str
+    :type x: int
+    :rtype:  str
+    """
+    return f(x)
+
+
+@typesafe(wrap_callables=True)
+def function_f3(n):
+    """
+    :type n: int
+    :rtype:  callable(int) -> int
+    """
+    return lambda x: x * n
+
+
+class Formatter(object):
+    def __call__(self, x, y=0):
+        return '{}'.format(x + y)
+
+
+def test_callables_01a():
+    from sphinx_typesafe.typesafe import get_class_type, CallableOf
+    t = get_class_type('callable(int, list of str) -> bool')
+    assert(isinstance(t, CallableOf))
+    assert(len(t.args) == 2)
+    assert(t.result is bool)
+    assert(get_class_type('callable').args is None)
+    assert(get_class_type('callable()').args == ())
+
+
+def test_callables_01b():
+    import pytest
+
+    @typesafe
+    def some_function(f):
+        """
+        :type f: callable
+        """
+        pass
+    some_function(len)
+    some_function(lambda: None)
+    with pytest.raises(TypeCheckError):
+        some_function(1)
+
+
+def test_callables_02a():
+    import pytest
+    # arity is verified, but types are not, without wrapping
+    assert(function_f1(str, 1) == '1')
+    assert(function_f1(lambda x, y=0: str(x + y), 1) == '1')
+    assert(function_f1(Formatter(), 1) == '1')
+    with pytest.raises(TypeCheckError) as e:
+        function_f1(lambda x, y: x, 1)
+    assert(e.value.parameter == 'f')
+    with pytest.raises(TypeCheckError):
+        function_f1(lambda: '', 1)
+
+
+def test_callables_02b():
+    import pytest
+    assert(function_f2(str, 1) == '1')
+    assert(function_f2(Formatter(), 1) == '1')
+    with pytest.raises(TypeCheckError) as e:
+        function_f2(lambda x: x, 1)
+    assert(e.value.parameter == 'result of f')
+    with pytest.raises(TypeCheckError):
+        function_f2(f=lambda x: x, x=1)
+
+
+def test_callables_02c():
+    import pytest
+    f = function_f3(2)
+    assert(f(3) == 6)
+    with pytest.raises(TypeCheckError) as e:
+        f('a')
+    assert(e.value.parameter == 'argument 0 of return')
+
+
+def test_callables_03a():
+    import pytest
+    try:
+        typesafe.configure(wrap_callables=False)
+        # the result of f is not verified, but the result of function_f2 still is
+        with pytest.raises(TypeCheckError) as e:
+            function_f2(lambda x: x, 1)
+        assert(e.value.parameter == 'return')
+        assert(function_f3(2)('a') == 'aa')
+    finally:
+        typesafe.configure(wrap_callables=True)
@@ -0,0 +1,95 @@
+from sphinx_typesafe.check import check_file, check_paths, main
+
+
+good_source = '''
+from sphinx_typesafe.typesafe import typesafe
+
+@typesafe
+def function_good(a, b=1):
+    """
+    :type a: int
+    :type b: int
+    :rtype:  str
+    """
+    return '{}{}'.format(a, b)
+
+@typesafe
+def function_variadic(a, *args, **kwargs):
+    """
+    :type a:      int
+    :type args:   tuple of int
+    :type kwargs: dict of str
+    """
+
+class ClassA(object):
+
+    @typesafe({ 'a': 'int', 'return': 'int' })
+    def method_good(self, a):
+        return a
+'''
+
+
+bad_source = '''
+from sphinx_typesafe.typesafe import typesafe
+
+@typesafe
+def function_bad(a, b='rubbish', c=2):
+    """
+    :type a: rubbish.Rubbish
+    :type b: int
+    :type z: int
+    """
+'''
+
+
+def test_check_01a(tmpdir):
+    path = tmpdir.join('good.py')
+    path.write(good_source)
+    assert(check_file(str(path)) == (str(path), []))
+
+
+def test_check_01b(tmpdir):
+    path = tmpdir.join('bad.py')
+    path.write(bad_source)
+    name, problems = check_file(str(path))
+    assert(len(problems) == 4)
+    assert('cannot resolve type "rubbish.Rubbish" of "a"' in problems[0])
+    assert('missing argument(s) expected' in problems[1] and "'c'" in problems[1])
+    assert('extra specification(s) detected' in problems[2] and "'z'" in problems[2])
+    assert('Wrong type for default of b' in problems[3])
+    assert(problems[0].startswith('{}:'.format(path)) and ': function_bad: ' in problems[0])
+
+
+def test_check_02a(tmpdir):
+    tmpdir.join('good.py').write(good_source)
+    tmpdir.mkdir('sub').join('bad.py').write(bad_source)
+    problems = check_paths([ str(tmpdir) ], jobs=2)
+    assert(len(problems) == 4)
+
+
+def test_check_02b(tmpdir):
+    import sphinx_typesafe.check
+    source = tmpdir.join('bad.py')
+    source.write(bad_source)
+    cache = str(tmpdir.join('cache'))
+    assert(len(check_paths([ str(source) ], cache=cache)) == 4)
+
+    # unchanged files are not checked again
+    checked = list()
+    original = sphinx_typesafe.check.check_file
+    sphinx_typesafe.check.check_file = lambda path: checked.append(path) or original(path)
+    try:
+        assert(len(check_paths([ str(source) ], cache=cache)) == 4)
+        assert(checked == [])
+        source.write(good_source)
+        assert(check_paths([ str(source) ], cache=cache) == [])
+        assert(checked == [ str(source) ])
+    finally:
+        sphinx_typesafe.check.check_file = original
+
+
+def test_check_03a(tmpdir):
+    tmpdir.join('good.py').write(good_source)
+    assert(main([ 'check', '--no-cache', str(tmpdir) ]) == 0)
+    tmpdir.join('bad.py').write(bad_source)
+    assert(main([ 'check', '--no-cache', str(tmpdir) ]) == 1)
@@ -0,0 +1,117 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+def test_compile_01a():
+    import pytest
+    with pytest.raises(AttributeError):
+        # missing specification is detected at decoration time
+        @typesafe
+        def some_function(a, b):
+            '''
+            :type a: int
+            '''
+            pass
+
+
+def test_compile_01b():
+    import pytest
+    with pytest.raises(AttributeError):
+        # extra specification is detected at decoration time
+        @typesafe({ 'a': 'int', 'b': 'int' })
+        def some_function(a):
+            pass
+
+
+def test_compile_01c():
+    import pytest
+    with pytest.raises(AttributeError):
+        class ClassA(object):
+            # missing specification is detected at decoration time
+            @typesafe
+            def method_a1(self, a, b):
+                '''
+                :type b: int
+                '''
+                pass
+
+
+def test_compile_02a():
+    import pytest
+
+    @typesafe
+    def some_function(a, b='rubbish'):
+        '''
+        :type a: int
+        :type b: int
+        '''
+        pass
+    # wrong default values are reported even when not employed
+    with pytest.raises(TypeCheckError) as e:
+        some_function(1, 2)
+    assert(e.value.parameter == 'b')
+
+
+def test_compile_02b():
+    @typesafe
+    def some_function(a, b=0, c=0.0, d='', e=None):
+        '''
+        :type a: int
+        :type b: int
+        :type c: float
+        :type d: str
+        :type e: types.NoneType
+        :rtype:  str
+        '''
+        return '{},{},{},{},{}'.format(a, b, c, d, e)
+    assert(some_function(1) == '1,0,0.0,,None')
+    assert(some_function(1, d='x') == '1,0,0.0,x,None')
+    assert(some_function(c=1.0, a=1) == '1,0,1.0,,None')
+
+
+def test_compile_03a():
+    import pytest
+
+    @typesafe
+    def some_function(a, b=0):
+        '''
+        :type a: int
+        :type b: int
+        '''
+        pass
+    with pytest.raises(AttributeError):
+        some_function(b=1)
+
+
+@typesafe
+def function_f1(a, b, c, x=0, y=0.0):
+    '''
+    :type a: int
+    :type b: float
+    :type c: str
+    :type x: int
+    :type y: float
+    :rtype:  str
+    '''
+    return '{},{},{},{},{}'.format(a, b, c, x, y)
+
+
+def test_compile_04a():
+    assert(function_f1(1, 2.0, 'c', 3, 4.0) == '1,2.0,c,3,4.0')
+    assert(function_f1(y=4.0, x=3, c='c', b=2.0, a=1) == '1,2.0,c,3,4.0')
+    assert(function_f1(1, 2.0, y=4.0, c='c') == '1,2.0,c,0,4.0')
+
+
+def test_compile_04b():
+    import pytest
+    with pytest.raises(TypeCheckError) as e:
+        function_f1(1, 2.0, 'c', y=4)
+    assert(e.value.parameter == 'y')
+    with pytest.raises(TypeCheckError) as e:
+        function_f1(1, 2.0, 3)
+    assert(e.value.parameter == 'c')
+
+
+def test_compile_04c():
+    import pytest
+    with pytest.raises(AttributeError):
+        function_f1(1, 2.0, 'c', rubbish=4)
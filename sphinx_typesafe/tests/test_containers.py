@@ -0,0 +1,60 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError, ContainerOf, get_class_type
+
+
+@typesafe
+def function_f1(a, b):
+    """Function with containers as arguments, returning a container.
+
+    :type a: list of int
+    :type b: dict of sphinx_typesafe.tests.geometry.Point
+    :rtype:  tuple of str
+    """
+    return tuple( '{}'.format(x) for x in a )
+
+
+@typesafe({ 'a': 'list   of   tuple of   float',
+            'return': 'int' })
+def function_f2(a):
+    return len(a)
+
+
+def test_container_01a():
+    from sphinx_typesafe.tests.geometry import Point
+    assert(function_f1([ 1, 2 ], { 'p': Point() }) == ('1', '2'))
+    assert(function_f1([], {}) == ())
+
+
+def test_container_01b():
+    import pytest
+    with pytest.raises(TypeCheckError) as e:
+        function_f1([ 1, 'rubbish' ], {})
+    assert(e.value.expected == ContainerOf(list, int))
+    assert(e.value.actual == ContainerOf(list, str))
+    assert(str(e.value) == "Wrong type for a: expected: <type 'list'> of <type 'int'>, actual: <type 'list'> of <type 'str'>.")
+
+
+def test_container_01c():
+    import pytest
+    from sphinx_typesafe.tests.geometry import Point
+    with pytest.raises(TypeCheckError) as e:
+        function_f1((1, 2), {})
+    assert(e.value.actual is tuple)
+    with pytest.raises(TypeCheckError) as e:
+        function_f1([], { 'p': Point(), 'q': 'rubbish' })
+    assert(e.value.parameter == 'b')
+
+
+def test_container_02a():
+    import pytest
+    assert(function_f2([ (1.0, 2.0), () ]) == 2)
+    with pytest.raises(TypeCheckError) as e:
+        function_f2([ (1.0, 2.0), (1.0, 2) ])
+    assert(e.value.actual == ContainerOf(list, ContainerOf(tuple, int)))
+
+
+def test_container_03a():
+    import types
+    assert(get_class_type(' list  of  int ') == ContainerOf(list, int))
+    assert(get_class_type('set of types.NotImplementedType')(set([ 1, 'a' ])))
+    assert(isinstance([ 1, 2 ], get_class_type('list of int')))
+    assert(not isinstance([ 1, 2 ], get_class_type('list of str')))
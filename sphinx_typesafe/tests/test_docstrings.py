@@ -0,0 +1,81 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError, parse_fields, parse_docstring
+
+
+def test_docstrings_01a():
+    fields = parse_fields('''Summary line.
+
+    :param a: first parameter
+    :type a: int
+    :param str b: second parameter, with an inline type
+    :param c: third parameter, whose type
+              spans several lines
+    :type c: list of
+             tuple of float
+    :type  d : callable(int, str) -> bool
+    :rtype: sphinx_typesafe.tests.geometry.Point
+    :raises ValueError: when things go wrong
+    ''')
+    assert(fields.types == ( ('a', 'int'), ('c', 'list of tuple of float'),
+                             ('d', 'callable(int, str) -> bool'), ('b', 'str') ))
+    assert(fields.rtype == 'sphinx_typesafe.tests.geometry.Point')
+    assert(fields.vartypes == ())
+
+
+def test_docstrings_01b():
+    fields = parse_fields('''
+    :ivar float x: abscissa
+    :ivar y: ordinate
+    :vartype y: float
+    :ivar int z: explicit vartype wins
+    :vartype z: str
+    ''')
+    assert(fields.vartypes == ( ('y', 'float'), ('z', 'str'), ('x', 'float') ))
+    assert(parse_docstring(None) == [ ('return', 'types.NoneType') ])
+    assert(parse_docstring(':TYPE a: int\n:RType: str') == [ ('a', 'int'), ('return', 'str') ])
+
+
+def test_docstrings_02a():
+    import pytest
+
+    @typesafe
+    def some_function(a, b):
+        """
+        :param int a: inline type
+        :param b: type given in the following lines
+        :type b: list
+                 of int
+        :rtype: int
+        """
+        return a
+    assert(some_function(1, [ 2 ]) == 1)
+    with pytest.raises(TypeCheckError) as e:
+        some_function(1, [ 'b' ])
+    assert(e.value.parameter == 'b')
+
+
+def test_docstrings_01c():
+    # prose following a field is not taken for a type
+    fields = parse_fields(':param n: a number\n:type n: int\nOf course, n must be positive.\n'
+                          ':rtype: list\nof course, a list.')
+    assert(fields.types == ( ('n', 'int'), ))
+    assert(fields.rtype == 'list')
+    fields = parse_fields('''
+    :type a: list
+    of course, a list.
+    :type b: list of
+        int
+    :type c: dict Of int
+    ''')
+    assert(fields.types == ( ('a', 'list'), ('b', 'list of int'), ('c', 'dict') ))
+
+
+def test_docstrings_01d(monkeypatch):
+    from sphinx_typesafe import typesafe as ts
+    doc = ':type a: int\n:rtype: str'
+    # parsed specifications are shared
+    assert(parse_fields(doc) is parse_fields(doc))
+    # the store is bounded: once full, docstrings are parsed without being remembered
+    monkeypatch.setattr(ts, '_specs_size', len(ts._specs))
+    doc = ':type b: int\n:rtype: str'
+    assert(parse_fields(doc) == parse_fields(doc))
+    assert(doc not in ts._specs)
@@ -0,0 +1,121 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+@typesafe
+def function_f1(a, b, c):
+    """Function with various arguments, returning one value.
+
+    :type a: types.IntType
+    :type b: types.IntType
+    :type c: types.IntType
+    :rtype:  types.StringType
+    """
+    return '{},{},{}'.format(a, b, c)
+
+
+@typesafe(collect=True)
+def function_f2(a, b, c):
+    """Function with various arguments, returning one value.
+
+    :type a: types.IntType
+    :type b: types.IntType
+    :type c: types.IntType
+    :rtype:  types.StringType
+    """
+    return '{},{},{}'.format(a, b, c)
+
+
+@typesafe({ 'a': 'int',
+            'b': 'int',
+            'return': 'int' }, collect=True)
+def function_f3(a, b=0):
+    return 42
+
+
+class ClassA(object):
+
+    @typesafe(collect=True)
+    def method_a1(self, a, b):
+        """
+        :type a: int
+        :type b: int
+        """
+        pass
+
+
+def test_error_01a():
+    import pytest
+    with pytest.raises(TypeCheckError) as e:
+        function_f1(1, 'rubbish', 3)
+    assert(isinstance(e.value, TypeError))
+    assert(e.value.function == 'function_f1')
+    assert(e.value.parameter == 'b')
+    assert(e.value.expected is int)
+    assert(e.value.actual is str)
+
+
+def test_error_01b():
+    import pytest
+    with pytest.raises(TypeCheckError) as e:
+        function_f1(1, 'rubbish', 3)
+    # message is formatted lazily, when requested
+    assert(e.value.args == ('function_f1', [ ('b', int, str) ]))
+    assert(str(e.value) == "Wrong type for b: expected: <type 'int'>, actual: <type 'str'>.")
+    assert(repr(e.value) == "TypeCheckError('function_f1', [('b', <type 'int'>, <type 'str'>)])")
+
+
+def test_error_01c():
+    import pickle
+    import pytest
+    with pytest.raises(TypeCheckError) as e:
+        function_f1(1, 'rubbish', 3)
+    # errors can be passed to other processes
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        error = pickle.loads(pickle.dumps(e.value, protocol))
+        assert(isinstance(error, TypeCheckError))
+        assert((error.function, error.violations) == (e.value.function, e.value.violations))
+        assert(str(error) == str(e.value))
+
+
+def test_error_02a():
+    import pytest
+    with pytest.raises(TypeCheckError) as e:
+        function_f1('rubbish', 'rubbish', 'rubbish')
+    assert(len(e.value.violations) == 1)
+
+
+def test_error_02b():
+    import pytest
+    with pytest.raises(TypeCheckError) as e:
+        function_f2('rubbish', 2, 3.0)
+    assert(e.value.violations == [ ('a', int, str), ('c', int, float) ])
+    assert(len(str(e.value).splitlines()) == 2)
+
+
+def test_error_02c():
+    import pytest
+    assert(function_f3(1) == 42)
+    with pytest.raises(TypeCheckError) as e:
+        function_f3('rubbish', b='rubbish')
+    assert([ v[0] for v in e.value.violations ] == [ 'a', 'b' ])
+
+
+def test_error_02d():
+    import pytest
+    c = ClassA()
+    with pytest.raises(TypeCheckError) as e:
+        c.method_a1(1.0, 2.0)
+    assert([ v[0] for v in e.value.violations ] == [ 'a', 'b' ])
+
+
+def test_error_03a():
+    import pytest
+    with pytest.raises(TypeCheckError) as e:
+        @typesafe
+        def some_function():
+            """
+            :rtype: int
+            """
+            return 'rubbish'
+        some_function()
+    assert(e.value.parameter == 'return')
@@ -0,0 +1,96 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError, TypeVar, get_class_type
+
+
+@typesafe
+def larger(a, b):
+    """
+    :type a: T
+    :type b: T
+    :rtype:  T
+    """
+    return a if a > b else b
+
+
+@typesafe
+def first(values, default=None):
+    """
+    :type values:  list of T
+    :type default: types.NotImplementedType
+    :rtype: T
+    """
+    return values[0] if values else default
+
+
+@typesafe
+def broken(a):
+    """
+    :type a: T
+    :rtype:  T
+    """
+    return str(a)
+
+
+@typesafe
+def total(*values):
+    """
+    :type values: tuple of N <= numbers.Number
+    :rtype: N
+    """
+    return sum(values)
+
+
+def test_generics_01a():
+    import pytest
+    assert(larger(1, 2) == 2)
+    assert(larger('a', 'b') == 'b')
+    with pytest.raises(TypeCheckError) as e:
+        larger(1, 'b')
+    assert(e.value.parameter == 'b')
+    assert(e.value.expected is int)
+    assert(e.value.actual is str)
+
+
+def test_generics_01b():
+    import pytest
+    from sphinx_typesafe.typesafe import ContainerOf
+    assert(first([ 1, 2 ]) == 1)
+    with pytest.raises(TypeCheckError) as e:
+        first([ 1, 'b' ])
+    assert(e.value.parameter == 'values')
+    assert(e.value.expected == ContainerOf(list, int))
+    assert(e.value.actual == ContainerOf(list, str))
+    # nothing was bound by an empty list
+    assert(first([], default='a') == 'a')
+    assert(broken('a') == 'a')
+    with pytest.raises(TypeCheckError) as e:
+        broken(1)
+    assert(e.value.parameter == 'return')
+    assert(e.value.expected is int)
+
+
+def test_generics_01c():
+    import pytest
+    assert(total(1, 2, 3) == 6)
+    with pytest.raises(TypeCheckError) as e:
+        total(1, 2.0)
+    assert(e.value.parameter == 'values[1]')
+    with pytest.raises(TypeCheckError) as e:
+        total('a', 'b')
+    assert(e.value.parameter == 'values[0]')
+    assert(repr(e.value.expected) == "N <= <class 'numbers.Number'>")
+
+
+def test_generics_02a():
+    import pytest
+    assert(get_class_type('T') == TypeVar('T'))
+    assert(get_class_type('list of T1') == get_class_type('list of T1'))
+
+    @typesafe
+    def some_function(a, b):
+        """
+        :type a: T <= int
+        :type b: T <= float
+        """
+        pass
+    with pytest.raises(AttributeError):
+        some_function(1, 2)
@@ -0,0 +1,77 @@
+from sphinx_typesafe import typesafe as ts
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+class Collector(object):
+    '''Collects events of decorated functions, like metrics or tracing code would.'''
+
+    def __init__(self):
+        self.events = list()
+
+    def before(self, name, args, kwargs):
+        self.events.append( ('before', name, args) )
+
+    def after(self, name, args, kwargs, result):
+        self.events.append( ('after', name, result) )
+
+    def violation(self, name, violations, arguments):
+        self.events.append( ('violation', name, [ v[0] for v in violations ]) )
+
+    def compile(self, name, types):
+        self.events.append( ('compile', name, types) )
+
+    def __enter__(self):
+        for event in ('before', 'after', 'violation', 'compile'):
+            typesafe.hook(event, getattr(self, event))
+        return self.events
+
+    def __exit__(self, *args):
+        for event in ('before', 'after', 'violation', 'compile'):
+            typesafe.unhook(event, getattr(self, event))
+
+
+def test_hooks_01a():
+    import pytest
+
+    @typesafe
+    def some_function(a, b=1):
+        """
+        :type a: int
+        :type b: int
+        :rtype: int
+        """
+        return a + b
+    slowpath = ts._slowpath
+    with Collector() as events:
+        assert(some_function(1) == 2)
+        with pytest.raises(TypeCheckError):
+            some_function(1, 'b')
+    assert(events == [ ('before', 'some_function', (1, )),
+                       ('compile', 'some_function', [ ('a', int), ('b', int), ('return', int) ]),
+                       ('after', 'some_function', 2),
+                       ('before', 'some_function', (1, 'b')),
+                       ('violation', 'some_function', [ 'b' ]) ])
+    # callbacks were unregistered, so calls take the fast path again
+    del events[:]
+    assert(some_function(2) == 3)
+    assert(events == [])
+    assert(ts._slowpath == slowpath)
+
+
+def test_hooks_01b():
+    import pytest
+
+    @typesafe(cache=2)
+    def some_function(a):
+        """
+        :type a: int
+        :rtype: int
+        """
+        return a
+    with Collector() as events:
+        assert(some_function(1) == 1)
+        assert(some_function(1) == 1)
+    # hits call callbacks too
+    assert([ e[0] for e in events ] == [ 'before', 'compile', 'after', 'before', 'after' ])
+    with pytest.raises(AttributeError):
+        typesafe.hook('rubbish', lambda *args: None)
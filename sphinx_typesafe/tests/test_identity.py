@@ -0,0 +1,116 @@
+from sphinx_typesafe.typesafe import typesafe
+from sphinx_typesafe.identity import identity, freeze, thaw
+
+
+class CountingMeta(type):
+    '''Counts how many times instances are verified.'''
+    count = 0
+
+    def __instancecheck__(cls, obj):
+        CountingMeta.count += 1
+        return True
+
+
+class Counted(object):
+    __metaclass__ = CountingMeta
+
+
+class Items(list):
+    '''A list which supports weak references.'''
+
+
+@typesafe(identity_cache=True)
+def function_f1(a):
+    """
+    :type a: tuple of sphinx_typesafe.tests.test_identity.Counted
+    """
+    pass
+
+
+@typesafe(identity_cache=True)
+def function_f2(a):
+    """
+    :type a: list of sphinx_typesafe.tests.test_identity.Counted
+    """
+    pass
+
+
+@typesafe
+def function_f3(a):
+    """
+    :type a: tuple of sphinx_typesafe.tests.test_identity.Counted
+    """
+    pass
+
+
+def checks(f, *args):
+    before = CountingMeta.count
+    f(*args)
+    return CountingMeta.count - before
+
+
+def test_identity_01a():
+    # immutable containers are verified only once
+    items = tuple( Counted() for i in range(100) )
+    assert(checks(function_f1, items) == 100)
+    assert(checks(function_f1, items) == 0)
+    assert(checks(function_f1, tuple(items)) == 0)
+    assert(checks(function_f1, items[1:]) == 99)
+
+
+def test_identity_01b():
+    # mutable containers are verified every time, unless frozen
+    items = [ Counted() for i in range(100) ]
+    assert(checks(function_f2, items) == 100)
+    assert(checks(function_f2, items) == 100)
+    freeze(items)
+    assert(checks(function_f2, items) == 100)
+    assert(checks(function_f2, items) == 0)
+    thaw(items)
+    assert(checks(function_f2, items) == 100)
+
+
+def test_identity_01c():
+    # the cache is opt-in
+    items = tuple( Counted() for i in range(100) )
+    assert(checks(function_f3, items) == 100)
+    assert(checks(function_f3, items) == 100)
+
+
+def test_identity_02a():
+    import gc
+    items = freeze(Items([ Counted() ]))
+    assert(checks(function_f2, items) == 1)
+    assert(checks(function_f2, items) == 0)
+    key = id(items)
+    assert(key in identity.entries and key in identity.frozen)
+    del items
+    gc.collect()
+    # entries are discarded when objects die
+    assert(key not in identity.entries and key not in identity.frozen)
+
+
+def test_identity_02b():
+    from sphinx_typesafe.identity import IdentityCache
+    from sphinx_typesafe.typesafe import get_class_type
+    cache = IdentityCache(size=2)
+    check = cache.remember(get_class_type('tuple of int'))
+    items = [ (i, ) for i in range(3) ]
+    for item in items:
+        assert(check(item))
+    assert(list(cache.entries) == [ id(items[1]), id(items[2]) ])
+
+
+def test_identity_02c():
+    from sphinx_typesafe.identity import IdentityCache
+    from sphinx_typesafe.typesafe import get_class_type
+    cache = IdentityCache(size=1)
+    check = cache.remember(get_class_type('tuple of list'))
+    items = cache.freeze(Items())
+    key = id(items)
+    assert(check(( items, )))
+    del items
+    # evicting the tuple kills the frozen list, which discards itself meanwhile
+    assert(check(( [], )))
+    assert(key not in cache.frozen)
+    cache.clear()
@@ -0,0 +1,167 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+from sphinx_typesafe.tests.geometry import Point, Circle
+
+
+class ClassA(object):
+    @typesafe
+    def method_a1(self, a, b=0):
+        """
+        :type a: int
+        :type b: int
+        :rtype:  str
+        """
+        return '{},{}'.format(a, b)
+
+    @typesafe
+    def method_a2(self):
+        """
+        :rtype: int
+        """
+        return 1
+
+
+class ClassB(ClassA):
+    @typesafe
+    def method_a1(self, a, b=0):
+        """Overrides without specification."""
+        return 'B:' + super(ClassB, self).method_a1(a, b)
+
+    @typesafe(inherit=True)
+    def method_a2(self):
+        return 2
+
+
+class ClassC(ClassB):
+    @typesafe
+    def method_a1(self, a, b=1):
+        return 'C:' + super(ClassC, self).method_a1(a, b)
+
+
+def test_inherit_01a():
+    import pytest
+    assert(Circle(0.0, 0.0, 1.0).distance(Point(3.0, 4.0)) == 4.0)
+    with pytest.raises(TypeCheckError) as e:
+        Circle().distance(1)
+    assert(e.value.parameter == 'p')
+
+
+def test_inherit_01b():
+    import pytest
+    assert(ClassB().method_a1(1) == 'B:1,0')
+    assert(ClassB().method_a2() == 2)
+    assert(ClassC().method_a1(1) == 'C:B:1,1')
+    with pytest.raises(TypeCheckError):
+        ClassC().method_a1('a')
+    with pytest.raises(TypeCheckError):
+        ClassB().method_a1(1, b='b')
+
+
+def test_inherit_02a():
+    def checker(cls, name):
+        return cls.__dict__[name].descriptor._descript__checker
+    ClassB().method_a1(1)
+    ClassC().method_a1(1)
+    # compiled specifications are shared when signatures are the same
+    assert(checker(ClassB, 'method_a1').compiled is checker(ClassA, 'method_a1').compiled)
+    assert(checker(ClassB, 'method_a1').entries is checker(ClassA, 'method_a1').entries)
+    # default values differ, so only entries are shared
+    assert(checker(ClassC, 'method_a1').compiled is not checker(ClassA, 'method_a1').compiled)
+    assert(checker(ClassC, 'method_a1').entries is checker(ClassA, 'method_a1').entries)
+
+
+def test_inherit_03a():
+    import pytest
+
+    class ClassD(object):
+        @typesafe
+        def method_d1(self, a):
+            pass
+    # nothing to inherit
+    with pytest.raises(TypeError):
+        ClassD().method_d1(1)
+
+    # functions defined outside classes fail at decoration
+    with pytest.raises(AttributeError):
+        @typesafe
+        def some_function(a):
+            pass
+    with pytest.raises(AttributeError):
+        @typesafe
+        def other_function(a, b):
+            pass
+
+
+def test_inherit_03c():
+    import pytest
+
+    class ClassD(object):
+        @typesafe
+        def method_d1(self, a):
+            pass
+
+    class ClassE(ClassD):
+        @typesafe
+        def method_d1(self, a):
+            pass
+    # the method is not taken for a missing attribute, calls fail instead
+    for cls in (ClassD, ClassE):
+        assert(hasattr(cls(), 'method_d1'))
+        assert(getattr(cls(), 'method_d1', None) is not None)
+        with pytest.raises(TypeError) as e:
+            getattr(cls(), 'method_d1')(1)
+        assert('missing argument(s)' in str(e.value))
+
+
+def test_inherit_03b():
+    import pytest
+
+    class ClassD(ClassA):
+        @typesafe
+        def method_a1(self, x, b=0):
+            pass
+    # parameters differ
+    with pytest.raises(TypeError):
+        ClassD().method_a1(1)
+    with pytest.raises(AttributeError):
+        class ClassE(ClassA):
+            @typesafe(inherit=True)
+            def method_a2(self):
+                """
+                :rtype: int
+                """
+                return 2
+
+
+def test_inherit_02b():
+    import pytest
+
+    class ClassD(object):
+        @typesafe
+        def method_d1(self, a, *args):
+            """
+            :type a:    list of int
+            :type args: tuple of int
+            """
+            pass
+
+    class ClassE(ClassD):
+        @typesafe(variadic_limit=1)
+        def method_d1(self, a, *args):
+            pass
+
+    class ClassF(ClassD):
+        @typesafe
+        def method_d1(self, a, *values):
+            pass
+    ClassD().method_d1([ 1 ], 2, 3)
+    ClassE().method_d1([ 1 ], 2, 'a')
+    # options differ, so the compiled specification is not shared
+    with pytest.raises(TypeCheckError):
+        ClassD().method_d1([ 1 ], 2, 'a')
+
+    def checker(cls):
+        return getattr(cls.__dict__['method_d1'], 'descriptor', cls.__dict__['method_d1'])._descript__checker
+    assert(checker(ClassE).compiled is not checker(ClassD).compiled)
+    # names of *args differ
+    with pytest.raises(TypeError):
+        ClassF().method_d1([ 1 ], 2)
@@ -0,0 +1,111 @@
+from sphinx_typesafe.typesafe import typesafe
+
+
+def allocated(build, n=200):
+    """Returns the average amount of memory, in bytes, retained by each object built.
+
+    Employs ``tracemalloc`` when available. Otherwise, sizes of all objects
+    tracked by the garbage collector are summed up.
+    """
+    import gc
+    try:
+        import tracemalloc
+    except ImportError:
+        tracemalloc = None
+
+    def measure():
+        gc.collect()
+        if tracemalloc:
+            return tracemalloc.get_traced_memory()[0]
+        import sys
+        return sum(sys.getsizeof(o) for o in gc.get_objects())
+
+    if tracemalloc: tracemalloc.start()
+    try:
+        before = measure()
+        keep = [ build() for i in range(n) ]
+        after = measure()
+    finally:
+        if tracemalloc: tracemalloc.stop()
+    assert(len(keep) == n)
+    return (after - before) / float(n)
+
+
+def make(decorator):
+    def build():
+        def some_function(a, b, c=0):
+            """Function with various arguments, returning one value.
+
+            :type a: int
+            :type b: str
+            :type c: int
+            :rtype:  int
+            """
+            return a
+        f = decorator(some_function)
+        f(1, 'b')
+        return f
+    return build
+
+
+def test_memory_01a():
+    plain = allocated(make(lambda f: f))
+    checked = allocated(make(typesafe))
+    # compiled specification included
+    assert(checked - plain < 4096)
+
+
+def test_memory_01b():
+    import pytest
+
+    class ClassA(object):
+        @typesafe({ 'return': 'int' })
+        def method_a1(self):
+            return 42
+    # the decorator does not carry a __dict__
+    with pytest.raises(AttributeError):
+        typesafe(lambda: None).__dict__
+    # the descriptor finds attributes of the user's function, without copying them
+    descriptor = ClassA.__dict__['method_a1']
+    assert(descriptor.__dict__ is descriptor.f.__dict__)
+    assert(ClassA().method_a1() == 42)
+
+
+def test_memory_01c():
+    class ClassA(object):
+        __slots__ = ('x', )
+
+        @typesafe
+        def method_a1(self, x):
+            """
+            :type x: int
+            """
+            self.x = x
+    # bound wrappers are not cached into instances
+    c = ClassA()
+    c.method_a1(42)
+    assert(c.x == 42)
+
+
+def test_memory_01d():
+    import inspect
+
+    @typesafe({ 'a': 'int' })
+    def function_a1(a):
+        '''Docstring of function_a1.'''
+        pass
+
+    class ClassA(object):
+        @typesafe
+        def method_a1(self, a):
+            """Docstring of method_a1.
+
+            :type a: int
+            """
+            pass
+    # names and docstrings are found in the user's function, not in the decorator
+    assert(function_a1.__doc__ == 'Docstring of function_a1.')
+    assert(inspect.getdoc(function_a1) == 'Docstring of function_a1.')
+    assert(ClassA().method_a1.__name__ == 'method_a1')
+    assert(inspect.getdoc(ClassA().method_a1).startswith('Docstring of method_a1.'))
+    assert(typesafe.__doc__ == 'Decorator which verifies function argument types')
@@ -0,0 +1,162 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+class ClassA(object):
+
+    @typesafe
+    @classmethod
+    def method_a1(cls, a):
+        """
+        :type a: int
+        :rtype:  str
+        """
+        return '{},{}'.format(cls.__name__, a)
+
+    @classmethod
+    @typesafe
+    def method_a2(cls, a):
+        """
+        :type a: int
+        :rtype:  str
+        """
+        return '{},{}'.format(cls.__name__, a)
+
+    @typesafe
+    @staticmethod
+    def method_a3(a):
+        """
+        :type a: int
+        :rtype:  str
+        """
+        return '{}'.format(a)
+
+    @staticmethod
+    @typesafe
+    def method_a4(a):
+        """
+        :type a: int
+        :rtype:  str
+        """
+        return '{}'.format(a)
+
+    @typesafe({ 'a': 'int', 'return': 'str' })
+    @classmethod
+    def method_a5(cls, a):
+        return '{},{}'.format(cls.__name__, a)
+
+
+class ClassB(ClassA):
+    pass
+
+
+def test_methods_01a():
+    import pytest
+    for method in ('method_a1', 'method_a2', 'method_a5'):
+        # class methods receive the class, either accessed by class or by instance
+        assert(getattr(ClassA, method)(1) == 'ClassA,1')
+        assert(getattr(ClassB(), method)(a=2) == 'ClassB,2')
+        with pytest.raises(TypeCheckError) as e:
+            getattr(ClassA, method)('a')
+        assert(e.value.parameter == 'a')
+
+
+def test_methods_01b():
+    import pytest
+    for method in ('method_a3', 'method_a4'):
+        assert(getattr(ClassA, method)(1) == '1')
+        assert(getattr(ClassA(), method)(a=2) == '2')
+        with pytest.raises(TypeCheckError) as e:
+            getattr(ClassA(), method)('a')
+        assert(e.value.parameter == 'a')
+
+
+def test_methods_01c():
+    # a specification is still verified against the signature at decoration time
+    import pytest
+    with pytest.raises(AttributeError):
+        class ClassC(object):
+            @typesafe
+            @classmethod
+            def method_c1(cls, a, b):
+                """
+                :type a: int
+                """
+                pass
+
+
+def test_methods_01d():
+    import pytest
+
+    # wrapped by classmethod, the class is passed as the receiver, which is not checked
+    class ClassC(object):
+        @classmethod
+        @typesafe
+        def method_c1(cls, a):
+            """
+            :type a: int
+            :rtype: type
+            """
+            return cls
+
+    class ClassD(ClassC):
+        pass
+    assert(ClassC.method_c1(1) is ClassC)
+    assert(ClassD().method_c1(a=1) is ClassD)
+    with pytest.raises(TypeCheckError) as e:
+        ClassD.method_c1('a')
+    assert(e.value.parameter == 'a')
+    # and on the slow path
+    with typesafe.enabled():
+        assert(ClassD.method_c1(1) is ClassD)
+        with pytest.raises(TypeCheckError):
+            ClassD.method_c1('a')
+
+    # the receiver may still be specified, then it is checked like an ordinary argument
+    class ClassE(object):
+        @classmethod
+        @typesafe
+        def method_e1(cls, a):
+            """
+            :type cls: type
+            :type a: int
+            :rtype: type
+            """
+            return cls
+    assert(ClassE.method_e1(1) is ClassE)
+    with pytest.raises(TypeCheckError) as e:
+        ClassE.__dict__['method_e1'].__func__(1, 1)
+    assert(e.value.parameter == 'cls')
+
+    # a function defined outside a class has no receiver
+    with pytest.raises(AttributeError):
+        @typesafe
+        def some_function(a, b):
+            """
+            :type b: int
+            """
+            pass
+
+    def other_function(a, b):
+        """
+        :type b: int
+        """
+        pass
+    with pytest.raises(AttributeError):
+        typesafe(other_function)(int, 2)
+
+
+def test_methods_02a():
+    import types
+    # static methods are not bound at all
+    assert(ClassA.method_a3 is ClassA().method_a3)
+    # instance methods are bound by means of MethodType, without closures
+
+    class ClassC(object):
+        @typesafe
+        def method_c1(self, a):
+            """
+            :type a: int
+            """
+            pass
+    assert(isinstance(ClassC().method_c1, types.MethodType))
+    ClassC().method_c1(1)
@@ -0,0 +1,116 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+@typesafe(outermost=True)
+def total(values, start):
+    """
+    :type values: list of int
+    :type start:  int
+    :rtype: int
+    """
+    if not values: return start
+    # recursive calls pass a tuple, which is accepted since they are not checked
+    return total(tuple(values[1:]), start + values[0])
+
+
+@typesafe
+def total_everywhere(values, start):
+    """
+    :type values: list of int
+    :type start:  int
+    :rtype: int
+    """
+    if not values: return start
+    return total_everywhere(tuple(values[1:]), start + values[0])
+
+
+@typesafe(outermost=True)
+def explode(n):
+    """
+    :type n: int
+    :rtype: int
+    """
+    if n == 0: raise ValueError(n)
+    return explode(n - 1)
+
+
+@typesafe(outermost=True)
+def spawn(n):
+    """
+    :type n: int
+    :rtype: list
+    """
+    import threading
+    errors = list()
+
+    def run():
+        try:
+            spawn('a')
+        except TypeCheckError as e:
+            errors.append(e)
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    return errors
+
+
+class Tree(object):
+
+    def __init__(self, *children):
+        self.children = children
+
+    @typesafe(outermost=True)
+    def size(self, extra):
+        """
+        :type extra: int
+        :rtype: int
+        """
+        # recursive calls pass None, which is accepted since they are not checked
+        return 1 + (extra or 0) + sum([ child.size(None) for child in self.children ])
+
+
+def test_outermost_01a():
+    import pytest
+    assert(total([ 1, 2, 3 ], 0) == 6)
+    with pytest.raises(TypeCheckError) as e:
+        total((1, 2, 3), 0)
+    assert(e.value.parameter == 'values')
+    with pytest.raises(TypeCheckError):
+        total_everywhere([ 1, 2, 3 ], 0)
+
+
+def test_outermost_01b():
+    import pytest
+    # the guard is reset when exceptions propagate
+    with pytest.raises(ValueError):
+        explode(3)
+    with pytest.raises(TypeCheckError):
+        explode('a')
+
+
+def test_outermost_01c():
+    # calls made by other threads are checked
+    errors = spawn(0)
+    assert(len(errors) == 1)
+    assert(errors[0].parameter == 'n')
+
+
+def test_outermost_01d():
+    import pytest
+    tree = Tree(Tree(), Tree(Tree()))
+    assert(tree.size(0) == 4)
+    with pytest.raises(TypeCheckError):
+        tree.size(None)
+
+
+def test_outermost_02a():
+    import pytest
+    try:
+        typesafe.configure(outermost=True)
+        assert(total_everywhere([ 1, 2, 3 ], 0) == 6)
+        with pytest.raises(TypeCheckError):
+            total_everywhere((1, 2, 3), 0)
+    finally:
+        typesafe.configure(outermost=False)
+    with pytest.raises(TypeCheckError):
+        total_everywhere([ 1, 2, 3 ], 0)
@@ -0,0 +1,46 @@
+pytest_plugins = str('pytester')
+
+
+def test_plugin_01a(testdir):
+    testdir.makepyfile(test_sample='''
+        from sphinx_typesafe.typesafe import typesafe
+
+        @typesafe
+        def called(a):
+            """
+            :type a: list of int
+            :rtype:  int
+            """
+            return len(a)
+
+        @typesafe
+        def never_called(a):
+            """
+            :type a: int
+            :rtype:  int
+            """
+            return a
+
+        def test_sample():
+            assert called(list(range(100))) == 100
+        ''')
+    result = testdir.runpytest('-p', 'sphinx_typesafe.pytest_plugin', '--typesafe-overhead')
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines([
+        '*typesafe overhead: tests spending most time in checks*',
+        '*1 * test_sample.py::test_sample',
+        '*typesafe overhead: functions spending most time in checks*',
+        '*1 * test_sample.called',
+        '*decorated functions never called*',
+        'test_sample.never_called',
+        ])
+
+
+def test_plugin_01b(testdir):
+    testdir.makepyfile(test_sample='''
+        def test_sample():
+            pass
+        ''')
+    result = testdir.runpytest('-p', 'sphinx_typesafe.pytest_plugin')
+    result.assert_outcomes(passed=1)
+    assert('typesafe overhead' not in result.stdout.str())
@@ -0,0 +1,83 @@
+from sphinx_typesafe.typesafe import typesafe
+from sphinx_typesafe.profiling import TypeProfile
+
+
+@typesafe
+def function_f1(a, b, c=None):
+    """
+    :type a: types.NotImplementedType
+    :type b: types.NotImplementedType
+    :type c: types.NotImplementedType
+    :rtype:  types.NotImplementedType
+    """
+    return a
+
+
+def observed(profile, calls):
+    try:
+        typesafe.observe(profile)
+        for args, kwargs in calls:
+            function_f1(*args, **kwargs)
+    finally:
+        typesafe.observe(None)
+    function, = profile.functions
+    return function
+
+
+def test_profiling_01a():
+    from sphinx_typesafe.tests.geometry import Point
+    profile = TypeProfile()
+    function = observed(profile, [ ((1, [ 1.0 ]), {}),
+                                   ((2, []), { 'c': Point() }),
+                                   ((True, [ 2.0, 3.0 ]), {}) ])
+    assert(profile.histogram(function, 'a') == [ ('int', 2), ('bool', 1) ])
+    # bool extends int; empty lists accept any element; defaults are not observed
+    assert(profile.suggestions(function) == [
+        ':type a: int',
+        ':type b: list of float',
+        ':type c: sphinx_typesafe.tests.geometry.Point',
+        ':rtype: int',
+        ])
+
+
+def test_profiling_01b():
+    profile = TypeProfile()
+    function = observed(profile, [ ((1, 'b'), {}),
+                                   (('a', 'b'), {}) ])
+    assert(profile.suggest(function, 'a') is None)
+    assert(profile.suggestions(function)[0] == '# :type a: ?  observed: int (1), str (1)')
+    assert(profile.suggestions(function)[1] == ':type b: str')
+
+
+def test_profiling_01c():
+    # histograms are bounded
+    profile = TypeProfile(limit=2)
+    function = observed(profile, [ ((1, None), {}),
+                                   (('a', None), {}),
+                                   ((1.0, None), {}),
+                                   ((1j, None), {}) ])
+    assert(profile.histogram(function, 'a') == [ ('(others)', 2), ('int', 1), ('str', 1) ])
+    assert(profile.suggest(function, 'a') is None)
+
+
+def test_profiling_02a():
+    import io
+    profile = TypeProfile()
+    observed(profile, [ ((1, 2), {}) ])
+    output = io.StringIO()
+    profile.report(output)
+    assert(output.getvalue().splitlines() == [
+        'sphinx_typesafe.tests.test_profiling.function_f1:',
+        '    :type a: int',
+        '    :type b: int',
+        '    :rtype: int',
+        ])
+
+
+def test_profiling_01d():
+    profile = TypeProfile()
+    function = observed(profile, [ ((1, { 'x': 'a' }), {}),
+                                   ((2, dict( (i, 'b') for i in range(1000) )), {}),
+                                   ((3, {}), {}) ])
+    # dictionaries are described by the type of their values
+    assert(profile.histogram(function, 'b') == [ ('dict of str', 2), ('dict', 1) ])
@@ -0,0 +1,67 @@
+from sphinx_typesafe.typesafe import typesafe
+
+
+def test_registry_01a():
+    import gc
+    import weakref
+
+    @typesafe
+    def some_function(a):
+        """
+        :type a: int
+        """
+        pass
+    assert(some_function.descriptor in typesafe.registered())
+    # the registry does not keep decorated functions alive
+    descriptor = weakref.ref(some_function.descriptor)
+    del some_function
+    gc.collect()
+    assert(descriptor() is None)
+
+
+def test_registry_02a():
+    @typesafe
+    def some_function(a):
+        """
+        :type a: int
+        """
+        pass
+
+    class ClassA(object):
+        @typesafe
+        def method_a1(self, a):
+            """
+            :type a: int
+            """
+            pass
+
+        @typesafe
+        @staticmethod
+        def method_a2(a):
+            """
+            :type a: int
+            """
+            pass
+
+    def checker(d):
+        return d._descript__checker
+    function = some_function.descriptor
+    method = ClassA.__dict__['method_a1'].descriptor
+    static = ClassA.__dict__['method_a2'].descriptor
+    assert(checker(function).compiled == [ None, None ])
+    typesafe.warmup(jobs=2)
+    assert(checker(function).compiled[False] is not None)
+    assert(checker(method).compiled[True] is not None)
+    assert(checker(static).compiled[False] is not None)
+
+
+def test_registry_02b():
+    @typesafe
+    def some_function(a):
+        """
+        :type a: rubbish.Rubbish
+        """
+        pass
+    failures = typesafe.warmup(jobs=1, freeze=True)
+    assert(some_function.descriptor in [ function for function, e in failures ])
+    del some_function
@@ -0,0 +1,193 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+from sphinx_typesafe.reporting import Reporter, reporter
+
+
+@typesafe(mode='warn')
+def function_f1(a, b):
+    """
+    :type a: int
+    :type b: int
+    :rtype:  str
+    """
+    return '{},{}'.format(a, b)
+
+
+class Handler(object):
+    '''Collects log records emitted by a reporter.'''
+
+    def __init__(self, reporter):
+        import logging
+        self.records = list()
+        self.handler = logging.Handler()
+        self.handler.emit = self.records.append
+        self.logger = reporter.logger
+
+    def __enter__(self):
+        self.logger.addHandler(self.handler)
+        return self.records
+
+    def __exit__(self, *args):
+        self.logger.removeHandler(self.handler)
+
+
+def drained(r, key, count):
+    '''Waits until ``count`` occurrences of ``key`` were drained by the background thread.
+    Counts are read under the lock, since they are updated after the queue is emptied.
+    '''
+    import time
+    for i in range(500):
+        with r.lock:
+            if r.counts[key] == count: return True
+        time.sleep(0.01)
+    return False
+
+
+def test_reporting_01a():
+    reporter.reset()
+    with Handler(reporter) as records:
+        for i in range(100):
+            assert(function_f1('a', 2) == 'a,2')
+        assert(reporter.statistics() == { ('function_f1', 'a', int, str): 100 })
+    # violations are deduplicated and aggregated
+    assert(len(records) == 1)
+    assert('100 times' in records[0].getMessage())
+
+
+def test_reporting_01b():
+    reporter.reset()
+    assert(function_f1(1.0, 2.0) == '1.0,2.0')
+    assert(sorted(reporter.statistics()) == [ ('function_f1', 'a', int, float),
+                                              ('function_f1', 'b', int, float) ])
+
+
+def test_reporting_02a():
+    import pytest
+
+    @typesafe
+    def some_function(a):
+        """
+        :type a: int
+        """
+        pass
+    reporter.reset()
+    try:
+        typesafe.configure(mode='warn')
+        some_function('a')
+    finally:
+        typesafe.configure(mode='raise')
+    assert(reporter.statistics() == { ('some_function', 'a', int, str): 1 })
+    with pytest.raises(TypeCheckError):
+        some_function('a')
+
+
+def test_reporting_02b():
+    import pytest
+    with pytest.raises(AttributeError):
+        typesafe.configure(mode='rubbish')
+    with pytest.raises(AttributeError):
+        @typesafe(mode='rubbish')
+        def some_function():
+            pass
+
+
+def test_reporting_03a():
+    r = Reporter(limit=2)
+    for i in range(5):
+        r.report('f', [ ('p{}'.format(i), int, str) ])
+    with Handler(r) as records:
+        r.flush()
+        assert(len(records) == 2)
+        r.flush()
+        assert(len(records) == 4)
+        r.flush()
+        assert(len(records) == 5)
+
+
+def test_reporting_03b():
+    r = Reporter(capacity=3)
+    for i in range(5):
+        r.report('f', [ ('a', int, str) ])
+    with Handler(r) as records:
+        assert(r.statistics() == { ('f', 'a', int, str): 3 })
+    assert('2 type violations were dropped' in records[-1].getMessage())
+
+
+def test_reporting_04a():
+    r = Reporter(interval=0.01)
+    r.report('f', [ ('a', int, str) ])
+    # drained by the background thread
+    assert(drained(r, ('f', 'a', int, str), 1))
+    with r.lock:
+        assert(not r.queue)
+
+
+def test_recent_01a():
+    import pytest
+    from sphinx_typesafe.reporting import recent
+
+    @typesafe
+    def some_function(a, b):
+        """
+        :type a: int
+        :type b: str
+        """
+        pass
+    recent.clear()
+    # recording is opt-in
+    with pytest.raises(TypeCheckError):
+        some_function(1, b=2)
+    assert(recent.entries() == [])
+    recent.enabled = True
+    try:
+        some_function(1, 'b')
+        assert(recent.entries() == [])
+        with pytest.raises(TypeCheckError):
+            some_function(1, b=2)
+    finally:
+        recent.enabled = False
+    entry, = recent.entries()
+    assert(entry.function == 'some_function')
+    assert(entry.violations == [ ('b', str, int) ])
+    assert(entry.arguments == (('a', int, '1'), ('b', int, '2')))
+    assert(entry.location[0].endswith('test_reporting.py'))
+    assert(entry.location[2] == 'test_recent_01a')
+
+
+def test_recent_01b():
+    from sphinx_typesafe.reporting import RingBuffer
+    r = RingBuffer(size=3, maxrepr=10)
+    for i in range(10):
+        r.record('f{}'.format(i % 2), [ ('a', int, str) ], [ ('a', 'x' * 100) ])
+    # memory is constant and only the most recent violations are kept
+    assert(len(r.slots) == 3)
+    assert([ e.sequence for e in r.entries() ] == [ 7, 8, 9 ])
+    assert([ e.sequence for e in r.entries(function='f1') ] == [ 7, 9 ])
+    assert(r.entries(parameter='b') == [])
+    assert(len(r.entries()[0].arguments[0][2]) <= 10)
+
+
+def test_recent_01c(tmpdir):
+    import json
+    from sphinx_typesafe.reporting import RingBuffer
+    r = RingBuffer(size=3)
+    r.record('f', [ ('a', int, str) ], [ ('a', 'x') ])
+    r.record('g', [ ('b', int, float) ], [ ('b', 1.0) ])
+    filename = str(tmpdir.join('violations.json'))
+    r.dump(filename)
+    lines = [ json.loads(line) for line in open(filename) ]
+    assert([ line['function'] for line in lines ] == [ 'f', 'g' ])
+    assert(lines[1]['violations'] == [ [ 'b', "<type 'int'>", "<type 'float'>" ] ])
+
+
+def test_reporting_04b():
+    import os
+    r = Reporter(interval=0.01)
+    r.report('f', [ ('a', int, str) ])
+    pid = os.fork()
+    if pid == 0:
+        # the thread of the parent was not inherited: another one drains the queue
+        r.report('f', [ ('a', int, str) ])
+        os._exit(0 if drained(r, ('f', 'a', int, str), 2) and r.thread.is_alive() else 1)
+    assert(os.waitpid(pid, 0)[1] == 0)
+    r.stop()
+    assert(not r.thread.is_alive())
@@ -0,0 +1,169 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+source = '''
+from __future__ import unicode_literals
+from sphinx_typesafe.typesafe import typesafe
+
+
+@typesafe
+def function_f1(a, b=1):
+    """
+    :type a: str
+    :type b: int
+    :rtype:  str
+    """
+    if b < 0:
+        return 1
+    return a * b
+
+
+@typesafe
+def function_f2(a):
+    """
+    :type a: list of {module}.Point
+    """
+    if not a:
+        return 'empty'
+
+
+@typesafe({{ 'a': 'int' }})
+def function_f3(a):
+    pass
+
+
+@typesafe
+def function_f4(a):
+    """
+    :type a: int
+    :rtype:  types.NotImplementedType
+    """
+    yield a
+
+
+class Point(object):
+
+    @typesafe
+    def __init__(self, x, y):
+        """
+        :type x: float
+        :type y: float
+        """
+        self.x, self.y = x, y
+
+    @staticmethod
+    @typesafe
+    def origin(x):
+        """
+        :type x: types.NotImplementedType
+        :rtype: {module}.Point
+        """
+        return Point(0.0, 0.0)
+'''
+
+
+def load(tmpdir, module):
+    import sys
+    from sphinx_typesafe import rewrite
+    tmpdir.join('{}.py'.format(module)).write(source.format(module=module))
+    sys.path.insert(0, str(tmpdir))
+    rewrite.install([ module ])
+    try:
+        return __import__(module)
+    finally:
+        rewrite.uninstall()
+        sys.path.remove(str(tmpdir))
+
+
+@typesafe
+def function_f1(a, b=1):
+    """
+    :type a: str
+    :type b: int
+    :rtype:  str
+    """
+    if b < 0:
+        return 1
+    return a * b
+
+
+def test_rewrite_01a(tmpdir):
+    import pytest
+    import types
+    m = load(tmpdir, 'rewritten_01a')
+    # decorator was removed
+    assert(isinstance(m.function_f1, types.FunctionType))
+    assert(m.function_f1('a', 2) == 'aa')
+    assert(m.function_f1(b=3, a='b') == 'bbb')
+    # same messages as @typesafe
+    for args in [ (1, 2), ('a', 'b'), ('a', -1) ]:
+        with pytest.raises(TypeCheckError) as expected:
+            function_f1(*args)
+        with pytest.raises(TypeCheckError) as actual:
+            m.function_f1(*args)
+        assert(str(actual.value) == str(expected.value))
+        assert(actual.value.violations == expected.value.violations)
+
+
+def test_rewrite_01b(tmpdir):
+    import pytest
+    import types
+    m = load(tmpdir, 'rewritten_01b')
+    assert(isinstance(m.function_f2, types.FunctionType))
+    # types are resolved on first call, implicit result is checked
+    assert(m.function_f2([ m.Point(1.0, 2.0) ]) is None)
+    with pytest.raises(TypeCheckError) as e:
+        m.function_f2([])
+    assert(e.value.parameter == 'return')
+    with pytest.raises(TypeCheckError) as e:
+        m.function_f2([ 1 ])
+    assert(e.value.parameter == 'a')
+    # methods: receiver is not checked
+    assert(isinstance(m.Point.__dict__['__init__'], types.FunctionType))
+    with pytest.raises(TypeCheckError) as e:
+        m.Point(1, 2.0)
+    assert(str(e.value) == "Wrong type for x: expected: <type 'float'>, actual: <type 'int'>.")
+    assert(isinstance(m.Point.origin('a'), m.Point))
+
+
+def test_rewrite_01c(tmpdir):
+    import types
+    m = load(tmpdir, 'rewritten_01c')
+    # decorators with arguments and generators keep being decorated
+    assert(not isinstance(m.function_f3, types.FunctionType))
+    assert(not isinstance(m.function_f4, types.FunctionType))
+    assert(list(m.function_f4(1)) == [ 1 ])
+
+
+def test_rewrite_02a(tmpdir):
+    import pytest
+    m = load(tmpdir, 'rewritten_02a')
+    with typesafe.disabled():
+        assert(m.function_f1(1, 2) == 2)
+    with pytest.raises(TypeCheckError):
+        m.function_f1(1, 2)
+    with pytest.raises(AttributeError):
+        from sphinx_typesafe import rewrite
+        rewrite.install('rewritten_02a')
+
+
+def test_rewrite_02b(tmpdir):
+    import sys
+    import types
+    from sphinx_typesafe import rewrite
+    # submodules of packages, which import other modules
+    package = tmpdir.mkdir('rewritten_02b')
+    package.join('__init__.py').write('')
+    package.join('point.py').write(source.format(module='rewritten_02b.point'))
+    package.join('shapes.py').write(source.format(module='rewritten_02b.shapes') + '\nfrom .point import Point as Base\n')
+    sys.path.insert(0, str(tmpdir))
+    rewrite.install([ 'rewritten_02b' ])
+    try:
+        m = __import__('rewritten_02b.shapes', fromlist=[ 'shapes' ])
+    finally:
+        rewrite.uninstall()
+        sys.path.remove(str(tmpdir))
+    assert(isinstance(m.__package__, str) and m.__package__ == 'rewritten_02b')
+    assert(isinstance(m.function_f1, types.FunctionType))
+    assert(m.function_f1('a', 2) == 'aa')
+    assert(m.Base is sys.modules['rewritten_02b.point'].Point)
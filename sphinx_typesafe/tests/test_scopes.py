@@ -0,0 +1,86 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+@typesafe
+def function_f1(a):
+    """
+    :type a: int
+    :rtype:  int
+    """
+    return a
+
+
+class ClassA(object):
+    @typesafe({ 'a': 'int', 'return': 'int' })
+    def method_a1(self, a):
+        return a
+
+
+def test_scopes_01a():
+    import pytest
+    with typesafe.disabled():
+        assert(function_f1('a') == 'a')
+        assert(ClassA().method_a1('a') == 'a')
+        with typesafe.enabled():
+            with pytest.raises(TypeCheckError):
+                function_f1('a')
+        assert(function_f1('a') == 'a')
+    with pytest.raises(TypeCheckError):
+        function_f1('a')
+
+
+def test_scopes_01b():
+    from sphinx_typesafe.reporting import reporter
+    reporter.reset()
+    with typesafe.enabled(level='warn'):
+        assert(function_f1('a') == 'a')
+    assert(reporter.statistics() == { ('function_f1', 'a', int, str): 1,
+                                      ('function_f1', 'return', int, str): 1 })
+
+
+def test_scopes_01c():
+    import pytest
+    with pytest.raises(AttributeError):
+        typesafe.enabled(level='rubbish')
+
+
+def test_scopes_01d():
+    from sphinx_typesafe import typesafe as ts
+    before = ts._slowpath
+    with typesafe.disabled():
+        with typesafe.enabled():
+            assert(ts._slowpath)
+        assert(ts._slowpath)
+    # calls take the fast path again once all scopes are exited
+    assert(ts._slowpath == before and ts._scopes == 0)
+
+
+def test_scopes_02a():
+    import threading
+    results = list()
+
+    def other():
+        try:
+            function_f1('a')
+        except TypeCheckError:
+            results.append('checked')
+    with typesafe.disabled():
+        # other threads are not affected
+        thread = threading.Thread(target=other)
+        thread.start()
+        thread.join()
+        assert(function_f1('a') == 'a')
+    assert(results == [ 'checked' ])
+
+
+def test_scopes_02b():
+    import pytest
+    try:
+        typesafe.configure(trusted=[ 'sphinx_typesafe.tests' ])
+        assert(function_f1('a') == 'a')
+        # explicitly enabled checks win over trusted packages
+        with typesafe.enabled():
+            with pytest.raises(TypeCheckError):
+                function_f1('a')
+    finally:
+        typesafe.configure(trusted=[])
@@ -0,0 +1,64 @@
+from sphinx_typesafe.typesafe import typesafe, parse_fields
+from sphinx_typesafe.sphinxext import render, render_docstring
+
+
+@typesafe
+def distance(a, b, scale=1.0):
+    """Distance between two points.
+
+    :param a: origin
+    :type a: sphinx_typesafe.tests.geometry.Point
+    :param b: destination
+    :type b: sphinx_typesafe.tests.geometry.Point
+    :param float scale: multiplier
+    :rtype: float
+    """
+    return scale
+
+
+class Shape(object):
+
+    @typesafe
+    def scaled(self, factors):
+        """
+        :type factors: list of
+                       float
+        :rtype: callable(int) -> T
+        """
+        pass
+
+
+def test_sphinxext_01a():
+    import inspect
+    lines = inspect.getdoc(typesafe.unwrap(distance)).splitlines()
+    # the specification parsed when decorated is reused
+    assert(parse_fields(inspect.getdoc(typesafe.unwrap(distance))) is
+           parse_fields('\n'.join(lines)))
+    assert(render_docstring(distance, lines) == [])
+    assert(lines[3] == ':type a: :class:`sphinx_typesafe.tests.geometry.Point`')
+    assert(lines[6] == ':param float scale: multiplier')
+    assert(lines[7] == ':rtype: :class:`float`')
+
+
+def test_sphinxext_01b():
+    lines = [ '', ':type factors: list of', '               float', ':rtype: callable(int) -> T' ]
+    # unbound methods are unwrapped too
+    assert(render_docstring(Shape.scaled, lines) == [])
+    assert(lines == [ '', ':type factors: :class:`list` of :class:`float`',
+                      ':rtype: :func:`callable`\\ (:class:`int`) -> *T*' ])
+
+
+def test_sphinxext_01c():
+    assert(render('types.NoneType') == (':obj:`None`', None))
+    assert(render('N <= numbers.Number') == ('*N* <= :class:`numbers.Number`', None))
+    text, error = render('dict of geometry.Missing')
+    assert(text == ':class:`dict` of ``geometry.Missing``')
+    assert(error.startswith('cannot resolve type geometry.Missing'))
+
+    def some_function(a):
+        """
+        :type a: sphinx_typesafe.tests.geometry.Missing
+        """
+        pass
+    lines = [ ':type a: sphinx_typesafe.tests.geometry.Missing' ]
+    assert(len(render_docstring(some_function, lines)) == 1)
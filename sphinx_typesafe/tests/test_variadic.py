@@ -0,0 +1,97 @@
+from sphinx_typesafe.typesafe import typesafe, TypeCheckError
+
+
+@typesafe
+def function_f1(a, *args, **kwargs):
+    """
+    :type a:      str
+    :type args:   tuple of int
+    :type kwargs: dict of float
+    :rtype: int
+    """
+    return len(args) + len(kwargs)
+
+
+@typesafe(variadic_limit=2)
+def function_f2(*values):
+    """
+    :type values: tuple of int
+    :rtype: int
+    """
+    return len(values)
+
+
+@typesafe
+def function_f3(a, *args):
+    """
+    :type a:    int
+    :type args: tuple
+    :rtype: int
+    """
+    return len(args)
+
+
+def test_variadic_01a():
+    import pytest
+    assert(function_f1('a') == 0)
+    assert(function_f1('a', 1, 2, 3, x=1.0, y=2.0) == 5)
+    with pytest.raises(TypeCheckError) as e:
+        function_f1('a', 1, 'b', 3)
+    assert(e.value.parameter == 'args[1]')
+    assert(e.value.actual is str)
+    # values of **kwargs are reported by keyword
+    with pytest.raises(TypeCheckError) as e:
+        function_f1('a', 1, x=1.0, y='b')
+    assert(e.value.parameter == 'y')
+    with pytest.raises(TypeCheckError) as e:
+        function_f1(1, 2)
+    assert(e.value.parameter == 'a')
+
+
+def test_variadic_01b():
+    import pytest
+    # no more than variadic_limit values are checked per call
+    assert(function_f2(1, 2, 'c', 'd') == 4)
+    with pytest.raises(TypeCheckError) as e:
+        function_f2(1, 'b', 3)
+    assert(e.value.parameter == 'values[1]')
+    # a bare container accepts values of any type
+    assert(function_f3(1, 'b', None) == 2)
+
+
+def test_variadic_01c():
+    import pytest
+
+    @typesafe(collect=True)
+    def some_function(*args, **kwargs):
+        """
+        :type args:   tuple of int
+        :type kwargs: dict of int
+        """
+        pass
+    with pytest.raises(TypeCheckError) as e:
+        some_function(1, 'a', 'b', c=3, d='d')
+    assert([ v[0] for v in e.value.violations ] == [ 'args[1]', 'args[2]', 'd' ])
+
+
+def test_variadic_02a():
+    import pytest
+
+    @typesafe
+    def some_function(*args):
+        """
+        :type args: list of int
+        """
+        pass
+    with pytest.raises(AttributeError):
+        some_function(1)
+
+    # unspecified **kwargs keep being rejected
+    @typesafe
+    def other_function(a, **kwargs):
+        """
+        :type a: int
+        """
+        pass
+    with pytest.raises(AttributeError):
+        other_function(1, b=2)
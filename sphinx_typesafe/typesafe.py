@@ -19,6 +19,66 @@
 from __future__ import unicode_literals
 from __future__ import print_function
 
+import collections
+import re
+import sys
+import threading
+import types
+import weakref
+
+from types import MethodType as _MethodType
+
+try:
+    from itertools import izip as _izip, imap as _imap
+except ImportError:
+    _izip, _imap = zip, map
+
+try:
+    from contextvars import ContextVar as _ContextVar
+except ImportError:
+    class _ContextVar(object):
+        """Stand-in for ``contextvars.ContextVar``, scoped by thread, when not available."""
+
+        def __init__(self, name, default=None):
+            self.name    = name
+            self.default = default
+            self.local   = threading.local()
+
+        def get(self):
+            return getattr(self.local, 'value', self.default)
+
+        def set(self, value):
+            token = self.get()
+            self.local.value = value
+            return token
+
+        def reset(self, token):
+            self.local.value = token
+
+
+def _nocase(word):
+    """Returns an expression which matches ``word`` in any case."""
+    return ''.join( '[{}{}]'.format(c.upper(), c) for c in word )
+
+
+# words of a type are separated by blanks, or continue on an indented line
+_sep = r"(?:[ \t]+|[ \t]*\n[ \t]+)"
+# a type is either a type name or a container of types, like ``list of int``.
+# Only the lowercase ``of`` separates types, so that prose following a field is ignored.
+_type = r"[\w\.]+(?:" + _sep + r"of" + _sep + r"[\w\.]+)*(?:[\s]*<=[\s]*[\w\.]+)?"
+# a callable may specify its arguments and result, like ``callable(int, str) -> bool``
+_callable = r"callable[\s]*\([^)\n]*\)(?:[\s]*->[\s]*" + _type + ")?"
+# matches any field which specifies a type, so that a docstring is scanned only once:
+# ``:type x: T`` or ``:vartype x: T``, ``:rtype: T`` and ``:param T x:`` or ``:ivar T x:``.
+# Types may continue on following lines, like ``list of`` followed by ``int``.
+# Names of fields are matched in any case, types are not.
+_any = "(?:" + _callable + "|" + _type + ")"
+# type variables are capital letters, optionally followed by digits, like ``T`` or ``T1``
+_typevar_re = re.compile(r"(?<![\w\.])[A-Z][0-9]*(?![\w\.])")
+_fields_re = re.compile(r":(?:(" + _nocase('type') + "|" + _nocase('vartype') + r")[\s]+(\w+)[\s]*:[\s]*(" + _any + ")"
+                        r"|" + _nocase('rtype') + r"[\s]*:[\s]*(" + _any + ")"
+                        r"|(" + _nocase('param') + "|" + _nocase('ivar') + r")[\s]+(" + _any + r")[\s]+(\w+)[\s]*:)")
+
 
 def get_unicode(s):
     if type(s) == str: s = unicode(s)
@@ -30,6 +90,503 @@ def get_unicode(s):
     return s
 
 
+class Fields(collections.namedtuple('Fields', 'types rtype vartypes')):
+    """Specification found in a Sphinx docstring.
+
+    ``types`` and ``vartypes`` are tuples of ``(name, type)`` entries of parameters and
+    instance attributes, in order of appearance. ``rtype`` is the name of the returned
+    type, or None.
+    """
+    __slots__ = ()
+
+
+# Specifications parsed from docstrings, by docstring. Shared by decorated functions
+# and classes, by the offline checker and by the Sphinx extension, so that each
+# docstring is parsed once per process. Bounded by _specs_size: once full, further
+# docstrings are parsed without being remembered.
+_specs = dict()
+_specs_size = 4096
+
+
+def parse_fields(doc):
+    """Obtain a specification from the field list of a Sphinx docstring, in a single pass.
+
+    Recognizes ``:type x: T``, ``:param T x:``, ``:rtype: T``, ``:vartype x: T`` and
+    ``:ivar T x:``. Types may continue on following lines. Explicit ``:type:`` and
+    ``:vartype:`` fields win over inline types, which are listed after them.
+
+    Results are remembered by docstring and shared, hence they are immutable.
+    """
+    fields = _specs.get(doc)
+    if fields is None:
+        fields = _parse_fields(doc)
+        if len(_specs) < _specs_size:
+            fields = _specs.setdefault(doc, fields)
+    return fields
+
+
+def _parse_fields(doc):
+    types, rtype, vartypes = list(), None, list()
+    inline, inline_vars = list(), list()
+    for found in _fields_re.finditer(doc or ''):
+        kind, name, t, r, ikind, it, iname = found.groups()
+        if kind:
+            (types if kind.lower() == 'type' else vartypes).append( (name, _continued(doc, found.start(), t)) )
+        elif ikind:
+            (inline if ikind.lower() == 'param' else inline_vars).append( (iname, ' '.join(it.split())) )
+        elif rtype is None:
+            rtype = _continued(doc, found.start(), r)
+    for table, found in ((types, inline), (vartypes, inline_vars)):
+        if found:
+            names = set( name for name, t in table )
+            table.extend( entry for entry in found if entry[0] not in names )
+    return Fields(tuple(types), rtype, tuple(vartypes))
+
+
+def _continued(doc, start, t):
+    """Returns type ``t`` of a field found at ``start`` of ``doc``, in a single line.
+    Following lines belong to the type only when indented further than the field.
+    """
+    lines = t.splitlines()
+    if len(lines) == 1:
+        return ' '.join(t.split())
+    # blanks preceding the field in its line
+    indent = 0
+    while indent < start and doc[start - indent - 1] in ' \t':
+        indent += 1
+    for i, line in enumerate(lines[1:], 1):
+        if len(line) - len(line.lstrip()) <= indent:
+            lines = lines[:i]
+            break
+    words = ' '.join(lines).split()
+    if words[-1] == 'of':
+        words.pop()
+    return ' '.join(words)
+
+
+def parse_docstring(doc):
+    """Obtain ``(name, type)`` entries from a Sphinx docstring.
+
+    The return type is reported under the name ``return`` and defaults to
+    ``types.NoneType`` when no ``:rtype:`` field is present.
+    """
+    fields = parse_fields(doc)
+    return list(fields.types) + [ (str('return'), fields.rtype or 'types.NoneType') ]
+
+
+def parse_vartypes(doc):
+    """Obtain ``(name, type)`` entries of instance attributes from a Sphinx docstring
+    of a class, given by ``:vartype:`` and ``:ivar T x:`` fields.
+    """
+    return parse_fields(doc).vartypes
+
+
+class TypeCheckError(TypeError):
+    """Raised when arguments or the result of a decorated function do not match
+    its specification.
+
+    The offending function, parameter, expected type and actual type are kept
+    as attributes. The message is only formatted when actually requested, so
+    that callers which catch and recover from the error do not pay for it.
+
+    When the decorator is employed with ``collect=True``, all violations found
+    in a call are reported at once in ``violations``, a list of
+    ``(parameter, expected, actual)`` tuples.
+    """
+
+    __error = 'Wrong type for {}: expected: {}, actual: {}.'
+
+    def __init__(self, function, violations):
+        # arguments are kept, so that errors can be represented and pickled
+        TypeError.__init__(self, function, violations)
+        self.function   = function
+        self.violations = violations
+
+    @property
+    def parameter(self):
+        return self.violations[0][0]
+
+    @property
+    def expected(self):
+        return self.violations[0][1]
+
+    @property
+    def actual(self):
+        return self.violations[0][2]
+
+    def __str__(self):
+        return '\n'.join([ self.__error.format(*v) for v in self.violations ])
+
+
+# Defaults which apply to all decorated functions, see: typesafe.configure
+_defaults = { 'mode': 'raise', 'wrap_callables': True, 'trusted': (), 'outermost': False }
+_modes = ('raise', 'warn')
+
+# Whether modules, by name, belong to trusted packages, see: _trusted_caller
+_callers = dict()
+# Level of checking in the current context: None, 'off', 'on' or a mode, see: typesafe.disabled
+_scope = _ContextVar('sphinx_typesafe.scope', default=None)
+# Whether decorated functions take the slow path, which may skip checks or time them,
+# so that the fast path costs a single lookup, see: _update_slowpath
+_slowpath = False
+# Number of scopes entered and not exited yet, in all threads, see: _Scope
+_scopes = 0
+# Guards _scopes and updates of _slowpath
+_lock = threading.Lock()
+# Times checks and bodies of decorated functions, see: typesafe.profile
+_profiler = None
+# Records types of arguments and results of decorated functions, see: typesafe.observe
+_observer = None
+# Callbacks registered for each event, see: typesafe.hook
+_hooks = { 'before': (), 'after': (), 'violation': (), 'compile': () }
+# All decorated functions and methods, by weak references
+_registry = weakref.WeakSet()
+# Decorated functions being called in each thread, whose recursive calls are not checked,
+# see: option outermost
+_calls = threading.local()
+# Frames running code of this module have these globals
+_globals = globals()
+
+# Marks absent values, where None is a legitimate value
+_missing = object()
+
+# Options accepted by the decorator, with their default values
+_options = {
+    # report all violations of a call at once, instead of the first one only
+    'collect': False,
+    # either raise TypeCheckError or report violations and proceed; None means _defaults
+    'mode': None,
+    # remember containers which satisfied their specification, see: sphinx_typesafe.identity
+    'identity_cache': False,
+    # wrap callables passed or returned, so that their arguments and results are checked
+    'wrap_callables': False,
+    # adopt the specification of the overridden method, found in the MRO
+    'inherit': False,
+    # check only the outermost call, not recursive calls made by the same thread
+    'outermost': False,
+    # maximum number of results remembered by arguments, or None; see: sphinx_typesafe.cache
+    'cache': None,
+    # maximum number of values of *args and **kwargs checked per call, or None for all
+    'variadic_limit': None,
+    }
+
+
+def _fail(function, mode, violations, arguments):
+    """Either raise ``TypeCheckError`` or report violations and proceed, depending on mode.
+
+    Either way, violations are recorded, together with ``arguments`` given as
+    ``(name, value)`` pairs, into ``sphinx_typesafe.reporting.recent``, when enabled.
+    """
+    from sphinx_typesafe.reporting import recent
+    if recent.enabled:
+        recent.record(function, violations, arguments)
+    for hook in _hooks['violation']:
+        hook(function, violations, arguments)
+    level = _scope.get()
+    if level in _modes: mode = level
+    if (mode or _defaults['mode']) == 'warn':
+        from sphinx_typesafe.reporting import reporter
+        reporter.report(function, violations)
+    else:
+        raise TypeCheckError(function, violations)
+
+
+def _update_slowpath():
+    """Tells decorated functions to take the slow path only whilst features which need it
+    are in use. Called with ``_lock`` held, whenever any of them changes.
+    """
+    global _slowpath
+    _slowpath = bool(_scopes or _defaults['trusted'] or _defaults['outermost'] or
+                     _profiler is not None or _observer is not None or
+                     _hooks['before'] or _hooks['after'])
+
+
+def _bypass():
+    """Tells whether checks are to be skipped, either because they were disabled
+    in the current context or because the caller belongs to a trusted package.
+    """
+    level = _scope.get()
+    if level is not None: return level == 'off'
+    return bool(_defaults['trusted']) and _trusted_caller()
+
+
+def _active():
+    """Returns the set of decorated functions being called by the current thread with
+    option ``outermost``, whose further calls are not checked.
+    """
+    try:
+        return _calls.functions
+    except AttributeError:
+        _calls.functions = set()
+        return _calls.functions
+
+
+def _trusted_caller():
+    """Tells whether the caller of a decorated function belongs to a trusted package.
+
+    Frames of this module are skipped. The verdict is cached by module name, so that
+    finding the caller costs a few attribute lookups, unlike ``inspect.stack``.
+    """
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_globals is _globals:
+        frame = frame.f_back
+    if frame is None: return False
+    return _trusted_module(frame.f_globals.get('__name__'))
+
+
+def _class_body():
+    """Tells whether the decorator is applied within the body of a class, where the first
+    parameter of a function may be the receiver of a method. Frames of this module are
+    skipped.
+    """
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_globals is _globals:
+        frame = frame.f_back
+    return frame is not None and frame.f_locals is not frame.f_globals and '__module__' in frame.f_locals
+
+
+def _trusted_module(name):
+    """Tells whether the module called ``name`` belongs to a trusted package."""
+    trusted = _callers.get(name)
+    if trusted is None:
+        trusted = bool(name) and any( name == p or name.startswith(p + '.') for p in _defaults['trusted'] )
+        _callers[name] = trusted
+    return trusted
+
+
+def predicate(cls):
+    """Returns a fast predicate which accepts instances of ``cls``, or None if ``cls`` is ignored."""
+    import types
+    if cls == types.NotImplementedType: return None
+    if isinstance(cls, (ContainerOf, CallableOf)): return cls
+    if isinstance(cls, TypeVar): return cls if cls.bound is not None else None
+    if isinstance(cls, types.TypeType):
+        # bound to the class, this is a builtin and avoids a Python frame per call
+        return type(cls).__instancecheck__.__get__(cls)
+    return lambda obj: isinstance(obj, cls)
+
+
+def _hashable(cls):
+    """Tells whether instances of ``cls`` may be hashable; ignored types are."""
+    if isinstance(cls, ContainerOf):
+        return _hashable(cls.container) and _hashable(cls.element)
+    if isinstance(cls, type):
+        return cls.__hash__ is not None
+    return True
+
+
+def violation(name, obj, cls):
+    """Returns a tuple ``(name, expected, actual)`` describing a type mismatch, or None."""
+    # return silently if either obj or cls is None
+    if obj is None and cls is None: return None
+    import types
+    # return silently if type is marked to be ignored
+    if cls == types.NotImplementedType: return None
+    # perform type checking
+    if isinstance(cls, (ContainerOf, CallableOf, TypeVar)):
+        if not cls(obj):
+            return (name, cls, cls.actual(obj))
+    elif obj is type or isinstance(obj, ( types.TypeType, 
+                                        types.ClassType, 
+                                        types.FunctionType )):
+        # print('Check argument {} type {} against {}'.format(name, obj, cls))
+        if not issubclass(obj, cls):
+            from zope.interface.verify import verifyObject
+            if not 'providedBy' in cls or not verifyObject(cls, obj):
+                return (name, cls, obj)
+    else:
+        # print('Check argument {} type {} against {}'.format(name, type(obj), cls))
+        if not isinstance(obj, cls):
+            return (name, cls, type(obj))
+    return None
+
+
+class ContainerOf(object):
+    """Type of containers whose elements are all of a certain type, like ``list of int``.
+
+    Values of dictionaries are verified, keys are not. Instances are predicates,
+    which also support ``isinstance``.
+    """
+
+    __slots__ = ('container', 'element', 'check', 'immutable')
+
+    def __init__(self, container, element):
+        self.container = container
+        self.element   = element
+        self.check     = predicate(element)
+        # immutable containers of immutable types keep satisfying the specification
+        self.immutable = container in (tuple, frozenset) and (
+            not isinstance(element, ContainerOf) or element.immutable)
+
+    def __call__(self, obj):
+        if not isinstance(obj, self.container): return False
+        if self.check is None: return True
+        if isinstance(obj, dict): obj = obj.itervalues()
+        return all(_imap(self.check, obj))
+
+    def __instancecheck__(self, obj):
+        return self(obj)
+
+    def actual(self, obj):
+        """Describes the actual type of an object which does not satisfy this type."""
+        if not isinstance(obj, self.container): return type(obj)
+        for item in (obj.itervalues() if isinstance(obj, dict) else obj):
+            if not self.check(item):
+                element = self.element.actual(item) if isinstance(self.element, ContainerOf) else type(item)
+                return ContainerOf(type(obj), element)
+        return type(obj)
+
+    def __eq__(self, other):
+        return isinstance(other, ContainerOf) and \
+            (self.container, self.element) == (other.container, other.element)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.container, self.element))
+
+    def __repr__(self):
+        return '{} of {}'.format(self.container, self.element)
+
+
+class CallableOf(object):
+    """Type of callables which accept certain arguments, like ``callable(int, str) -> bool``.
+
+    A bare ``callable`` accepts any callable object. Otherwise, the number of
+    arguments is verified against the signature of the callable, whenever it can
+    be found. Types of arguments and result can only be verified when calls
+    happen, see option ``wrap_callables`` of the decorator.
+    """
+
+    __slots__ = ('args', 'result', 'checks', 'rcheck', 'checked')
+
+    immutable = False
+
+    def __init__(self, args=None, result=None):
+        self.args    = args     # types of arguments, or None when not specified
+        self.result  = result   # type of the result, or None when not specified
+        self.checks  = tuple( predicate(t) for t in args ) if args is not None else None
+        self.rcheck  = predicate(result) if result is not None else None
+        self.checked = any(c is not None for c in self.checks or ()) or self.rcheck is not None
+
+    def __call__(self, obj):
+        if not callable(obj): return False
+        if self.args is None: return True
+        arity = _arity(obj)
+        return arity is None or arity[0] <= len(self.args) <= arity[1]
+
+    def __instancecheck__(self, obj):
+        return self(obj)
+
+    def actual(self, obj):
+        """Describes the actual type of an object which does not satisfy this type."""
+        if not callable(obj): return type(obj)
+        arity = _arity(obj)
+        accepted = arity[0] if arity[0] == arity[1] else \
+            '{}..{}'.format(arity[0], '' if arity[1] == float('inf') else arity[1])
+        return '{} accepting {} argument(s)'.format(type(obj), accepted)
+
+    def __eq__(self, other):
+        return isinstance(other, CallableOf) and \
+            (self.args, self.result) == (other.args, other.result)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.args, self.result))
+
+    def __repr__(self):
+        if self.args is None: return 'callable'
+        return 'callable({}){}'.format(
+            ', '.join([ '{}'.format(t) for t in self.args ]),
+            ' -> {}'.format(self.result) if self.result is not None else '')
+
+
+class TypeVar(object):
+    """Type variable, like ``T``, which stands for the type of the first value matched
+    against it in a call: further values must be instances of that type. A bound, like
+    ``T <= numbers.Number``, restricts the types it may stand for.
+
+    Outside of calls, like in specifications of callables, instances are predicates
+    which only verify the bound.
+    """
+
+    __slots__ = ('name', 'bound', 'index')
+
+    immutable = False
+
+    def __init__(self, name, bound=None):
+        self.name  = name
+        self.bound = bound  # type, or None when any type is accepted
+        self.index = None   # slot of the type bound in a call, see: typesafe.__checker.bind
+
+    def __call__(self, obj):
+        return self.bound is None or isinstance(obj, self.bound)
+
+    def __instancecheck__(self, obj):
+        return self(obj)
+
+    def actual(self, obj):
+        return type(obj)
+
+    def __eq__(self, other):
+        return isinstance(other, TypeVar) and (self.name, self.bound) == (other.name, other.bound)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.name, self.bound))
+
+    def __repr__(self):
+        return self.name if self.bound is None else '{} <= {}'.format(self.name, self.bound)
+
+
+def _generic(cls):
+    """Tells whether ``cls`` is a type variable or a container of type variables."""
+    while isinstance(cls, ContainerOf):
+        cls = cls.element
+    return isinstance(cls, TypeVar)
+
+
+def _arity(fn):
+    """Returns ``(minimum, maximum)`` number of positional arguments accepted by ``fn``,
+    or None when it cannot be found, like for builtins.
+    """
+    import types
+    skip = 0
+    if isinstance(fn, types.MethodType):
+        skip = 0 if fn.__self__ is None else 1
+        fn = fn.__func__
+    elif not isinstance(fn, types.FunctionType):
+        # instances of classes which define __call__ in Python
+        call = getattr(type(fn), '__call__', None)
+        call = getattr(call, '__func__', call)
+        if not isinstance(call, types.FunctionType): return None
+        skip, fn = 1, call
+    code = getattr(fn, '__code__', None)
+    if code is None: return None
+    count = code.co_argcount - skip
+    defaults = len(fn.__defaults__ or ())
+    varargs = code.co_flags & 0x04  # CO_VARARGS
+    return (max(count - defaults, 0), float('inf') if varargs else count)
+
+
+def _parse_callable(kls):
+    """Parses ``callable``, ``callable(a, b)`` or ``callable(a, b) -> r`` into a ``CallableOf``."""
+    head, sep, rest = kls.partition('(')
+    if not sep:
+        return CallableOf()
+    params, _, result = rest.partition(')')
+    result = result.strip()
+    if result and not result.startswith('->'):
+        raise NameError('Malformed callable specification: {}'.format(kls))
+    args = tuple( get_class_type(a) for a in params.split(',') if a.strip() )
+    return CallableOf(args, get_class_type(result[2:]) if result else None)
+
+
 def get_class_type(klass):
     def get_type(obj):
         import types
@@ -41,6 +598,14 @@ def get_class_type(klass):
             return type(obj)
 
     kls = get_unicode(klass)
+    if kls == 'callable' or re.match(r"callable[\s]*\(", kls):
+        return _parse_callable(kls)
+    container, of, element = ' '.join(kls.split()).partition(' of ')
+    if of:
+        return ContainerOf(get_class_type(container), get_class_type(element))
+    name, le, bound = [ part.strip() for part in kls.partition('<=') ]
+    if re.match(r"[A-Z][0-9]*$", name):
+        return TypeVar(name, get_class_type(bound) if le else None)
     if kls.count('.') > 0:
         parts = kls.rpartition('.')
         import importlib
@@ -56,19 +621,84 @@ def get_class_type(klass):
         return get_type(t)
 
 
+class _Scope(object):
+    """Context manager which sets the level of checking, see: ``typesafe.disabled``."""
+
+    __slots__ = ('level', 'tokens')
+
+    def __init__(self, level):
+        self.level  = level
+        self.tokens = list()
+
+    def __enter__(self):
+        global _scopes
+        with _lock:
+            _scopes += 1
+            _update_slowpath()
+        self.tokens.append(_scope.set(self.level))
+        return self
+
+    def __exit__(self, *args):
+        global _scopes
+        _scope.reset(self.tokens.pop())
+        with _lock:
+            _scopes -= 1
+            _update_slowpath()
+
+
+class _Docstring(object):
+    """Descriptor of ``__doc__`` of decorators, which finds the docstring of the user's
+    function, when known, or else the docstring of the class.
+    """
+
+    __slots__ = ('doc', )
+
+    def __init__(self, doc):
+        self.doc = doc
+
+    def __get__(self, instance, klass):
+        f = instance.f if instance is not None else None
+        return f.__doc__ if f is not None else self.doc
+
+
 class typesafe(object):
     """Decorator which verifies function argument types"""
 
+    __doc__ = _Docstring(__doc__)
+
+    # Runtime objects employ __slots__, so that each decorated function costs
+    # a small and fixed amount of memory.
+    __slots__ = ('f', 'options', 'dargs', 'dkwargs', 'descriptor')
+
+    def __new__(cls, *args, **kwargs):
+        if len(args) == 1 and not kwargs and isinstance(args[0], type):
+            # Decorator applied to a class, without parameters: see __typed_class
+            return cls.__typed_class(args[0], _options)
+        return object.__new__(cls)
+
     def __init__(self, *args, **kwargs):
         import copy
-        self.noparams = len(args) == 1 and not kwargs and callable(args[0])
-        if self.noparams:
+        # Options are keyword arguments, see: _options
+        self.options = dict( (name, kwargs.pop(name, value)) for name, value in _options.items() )
+        if self.options['mode'] not in (None, ) + _modes:
+            raise AttributeError('@typesafe: mode must be one of {}'.format(_modes))
+        cache = self.options['cache']
+        if cache is not None and (not isinstance(cache, (int, long)) or isinstance(cache, bool) or cache < 1):
+            raise AttributeError('@typesafe: cache must be a positive number of results')
+        limit = self.options['variadic_limit']
+        if limit is not None and (not isinstance(limit, (int, long)) or isinstance(limit, bool) or limit < 0):
+            raise AttributeError('@typesafe: variadic_limit must be a number of arguments')
+        noparams = len(args) == 1 and not kwargs and (
+            callable(args[0]) or isinstance(args[0], (classmethod, staticmethod)))
+        if noparams:
             # Decorator called without parameters.
             # User's function or class method is passed as arg[0].
-            # Initialize decorator arguments as emptly values.
+            # Decorator arguments are not needed.
             self.f = args[0]
-            self.dargs   = list()
-            self.dkwargs = dict()
+            self.dargs   = None
+            self.dkwargs = None
+            # The specification is verified against the signature at decoration time
+            self.descriptor = self.__descriptor(self.f)
         else:
             # Decorator called with parameters.
             # User's function or class method will be passed later.
@@ -76,9 +706,8 @@ class typesafe(object):
             self.f = None
             self.dargs   = copy.copy(args)
             self.dkwargs = copy.copy(kwargs)
-
-        # The descriptor initialization is delayed as much as possible
-        self.descriptor = None
+            # The descriptor initialization is delayed until the function is known
+            self.descriptor = None
 
     def __get__(self, instance, klass):
         '''Called when a decorator is applied to a class method only.
@@ -93,8 +722,8 @@ class typesafe(object):
                   Python runtime calls its __call__ method, the decorator logic
                   will execute.
         '''
-        # delegate __get__ to a newly built descriptor
-        return self.__descriptor(self.f, *(self.dargs), **(self.dkwargs)).__get__(instance, klass)
+        # delegate __get__ to the descriptor built at decoration time
+        return self.descriptor.__get__(instance, klass)
 
     def __call__(self, *args, **kwargs):
         '''This method is called in when:
@@ -104,7 +733,10 @@ class typesafe(object):
         '''
         if self.f:
             # This case applies to function calls only, not method calls
-            return self.__descriptor(self.f).__call__(*args, **kwargs)
+            return self.descriptor(*args, **kwargs)
+        elif isinstance(args[0], type):
+            # This case applies to decorator with arguments, applied to a class
+            return self.__typed_class(args[0], self.options, *(self.dargs), **(self.dkwargs))
         else:
             # This case applies to decorator with arguments
             self.f = args[0]
@@ -115,7 +747,215 @@ class typesafe(object):
         definition of the method wrapper, because the user's function or class method
         to be decorated in only knowable later.
         '''
-        return self.__descript(f, self.__checker(f, *args, **kwargs))
+        # classmethod and staticmethod objects are unwrapped, see: __descript.__get__
+        kind = type(f) if isinstance(f, (classmethod, staticmethod)) else None
+        if kind is not None: f = f.__func__
+        # only functions defined in classes may receive an unspecified receiver
+        member = kind is classmethod or (kind is None and _class_body())
+        return self.__descript(f, kind, self.__checker(f, self.options, member, *args, **kwargs), self.options)
+
+    @classmethod
+    def __typed_class(cls, klass, options, *args, **kwargs):
+        '''Installs a data descriptor onto ``klass`` for each instance attribute specified
+        by ``:vartype:`` fields of its docstring, or by a dictionary passed to the decorator,
+        so that assignments are checked. Returns ``klass``.
+        '''
+        import inspect
+        if args or kwargs:
+            if len(args) != 1 or kwargs or not isinstance(args[0], dict):
+                raise AttributeError('@typesafe: parameter must be a dictionary')
+            entries = args[0].items()
+        else:
+            entries = parse_vartypes(inspect.getdoc(klass))
+        for name, t in entries:
+            name = name.strip()
+            current = klass.__dict__.get(name, _missing)
+            # attributes declared in __slots__ keep being stored in their slots
+            storage = current if inspect.ismemberdescriptor(current) else None
+            default = _missing if storage is not None else current
+            setattr(klass, name, cls.__attribute(
+                klass.__name__, name, get_unicode(t), options['mode'], storage, default))
+        return klass
+
+    @staticmethod
+    def configure(mode=None, wrap_callables=None, trusted=None, outermost=None):
+        '''Sets defaults which apply to all decorated functions.
+
+        :param mode: ``'raise'`` raises ``TypeCheckError`` when a violation is found,
+                     whilst ``'warn'`` reports violations in background, by means of
+                     ``sphinx_typesafe.reporting.reporter``, and proceeds.
+                     Functions decorated with an explicit ``mode`` are not affected.
+        :param wrap_callables: ``False`` skips wrapping of callables everywhere, even for
+                     functions decorated with ``wrap_callables=True``.
+        :param trusted: names of packages whose calls to decorated functions are not
+                     checked, since they are supposed to pass values already checked at
+                     the boundaries of the package. An empty list checks all calls.
+        :param outermost: ``True`` checks only outermost calls of all decorated functions,
+                     like option ``outermost`` of the decorator does.
+        '''
+        if mode is not None:
+            if mode not in _modes:
+                raise AttributeError('@typesafe: mode must be one of {}'.format(_modes))
+            _defaults['mode'] = mode
+        if wrap_callables is not None:
+            _defaults['wrap_callables'] = bool(wrap_callables)
+        if trusted is not None:
+            if isinstance(trusted, (str, unicode)):
+                raise AttributeError('@typesafe: trusted must be a list of package names')
+            _defaults['trusted'] = tuple(trusted)
+            _callers.clear()
+        if outermost is not None:
+            _defaults['outermost'] = bool(outermost)
+        with _lock:
+            _update_slowpath()
+
+    @staticmethod
+    def profile(profiler):
+        '''Times checks and bodies of decorated functions by means of ``profiler``, or
+        stops timing when ``profiler`` is None.
+
+        ``profiler`` provides ``clock()``, returning seconds, and
+        ``record(function, checks, body)``, called after each checked call with the
+        time spent in checks and in the body of ``function``. The time spent in the body
+        includes calls of other decorated functions.
+        See: ``sphinx_typesafe.pytest_plugin``.
+        '''
+        global _profiler
+        with _lock:
+            _profiler = profiler
+            _update_slowpath()
+
+    @staticmethod
+    def observe(observer):
+        '''Records types of arguments and results of decorated functions by means of
+        ``observer``, or stops recording when ``observer`` is None.
+
+        ``observer`` provides ``observe(function, arguments, result)``, called after each
+        checked call with arguments as ``(name, value)`` pairs.
+        See: ``sphinx_typesafe.profiling.TypeProfile``.
+        '''
+        global _observer
+        with _lock:
+            _observer = observer
+            _update_slowpath()
+
+    @staticmethod
+    def hook(event, callback):
+        '''Registers ``callback`` to be called on ``event``, which is one of:
+
+        * ``'before'``: ``callback(name, args, kwargs)``, before arguments of a call
+          to the decorated function or method called ``name`` are checked;
+        * ``'after'``: ``callback(name, args, kwargs, result)``, after the result of
+          a call is checked or served from a cache;
+        * ``'violation'``: ``callback(name, violations, arguments)``, when violations are
+          found, before they are raised or reported, with arguments as ``(name, value)``
+          pairs. Violations of attributes and of rewritten functions are included;
+        * ``'compile'``: ``callback(name, types)``, when a specification is compiled, with
+          types resolved as ``(parameter, type)`` pairs, including ``return``.
+
+        Whilst no ``'before'`` or ``'after'`` callbacks are registered, calls do not pay
+        for them. Returns ``callback``.
+        '''
+        if event not in _hooks:
+            raise AttributeError('@typesafe: event must be one of {}'.format(tuple(sorted(_hooks))))
+        with _lock:
+            _hooks[event] += (callback, )
+            _update_slowpath()
+        return callback
+
+    @staticmethod
+    def unhook(event, callback):
+        '''Unregisters ``callback`` from ``event``, see: ``hook``.'''
+        if event not in _hooks:
+            raise AttributeError('@typesafe: event must be one of {}'.format(tuple(sorted(_hooks))))
+        with _lock:
+            _hooks[event] = tuple( hook for hook in _hooks[event] if hook != callback )
+            _update_slowpath()
+
+    @staticmethod
+    def registered():
+        '''Returns all decorated functions and methods which are still alive.'''
+        return list(_registry)
+
+    @staticmethod
+    def unwrap(obj):
+        '''Returns the function decorated by ``obj``, or ``obj`` itself when it is not
+        decorated. Unbound methods obtained from classes are unwrapped as well.
+        '''
+        if isinstance(obj, typesafe) and obj.descriptor is not None:
+            obj = obj.descriptor
+        if isinstance(obj, typesafe.__descript):
+            obj = obj.f
+            return obj.__func__ if isinstance(obj, (classmethod, staticmethod)) else obj
+        return getattr(obj, '__wrapped__', obj)
+
+    @staticmethod
+    def warmup(jobs=4, freeze=False):
+        '''Compiles specifications of all decorated functions and methods ahead of their
+        first calls, so that the first requests do not pay for resolving type names.
+
+        Functions are grouped by module and groups are compiled by ``jobs`` threads.
+        Overriding methods which inherit specifications are only compiled when bound.
+
+        In pre-fork servers, call it in the master process, so that workers inherit
+        compiled specifications. With ``freeze=True``, objects are moved into the
+        permanent generation by means of ``gc.freeze``, where available, so that the
+        garbage collector does not touch them and pages stay shared by workers.
+
+        Returns a list of ``(function, exception)`` pairs, for specifications which
+        could not be compiled.
+        '''
+        import collections
+        groups = collections.defaultdict(list)
+        for function in list(_registry):
+            groups[getattr(function.f, '__module__', None)].append(function)
+
+        def compile_group(group):
+            failures = list()
+            for function in group:
+                try:
+                    function.compile()
+                except Exception as e:
+                    failures.append( (function, e) )
+            return failures
+
+        if jobs > 1 and len(groups) > 1:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(min(jobs, len(groups)))
+            try:
+                results = pool.map(compile_group, list(groups.values()))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            results = [ compile_group(group) for group in groups.values() ]
+        if freeze:
+            import gc
+            if hasattr(gc, 'freeze'):
+                gc.collect()
+                gc.freeze()
+        return [ failure for failures in results for failure in failures ]
+
+    @staticmethod
+    def disabled():
+        '''Returns a context manager which skips checks of decorated functions.
+
+        Checks are skipped in the current thread, or in the current task when
+        ``contextvars`` is available; other threads and tasks are not affected.
+        '''
+        return _Scope('off')
+
+    @staticmethod
+    def enabled(level=None):
+        '''Returns a context manager which enables checks of decorated functions,
+        even when disabled by an enclosing context or skipped for trusted packages.
+
+        :param level: either ``'raise'`` or ``'warn'``, overriding the mode of
+                     decorated functions; or None, keeping it.
+        '''
+        if level not in (None, ) + _modes:
+            raise AttributeError('@typesafe: level must be one of {}'.format(_modes))
+        return _Scope(level or 'on')
 
     class __descript(object):
         '''This class is intended to delay the definition of the method wrapper
@@ -146,13 +986,47 @@ class typesafe(object):
         ``instance`` object is passed and a bounded reference to the user's class
         method and then (3) finally, method ``__call__`` is called, in order to
         execute the bounded class method.
+
+        Decorated ``classmethod`` and ``staticmethod`` objects are unwrapped and their
+        ``kind`` is kept, so that ``__get__`` binds them like Python would.
         '''
-        def __init__(self, f, checker):
+        __doc__ = _Docstring(__doc__)
+
+        __slots__ = ('f', 'kind', 'member', 'outermost', 'cache', 'slow', '__name__', '__checker', '__bound',
+                     '__weakref__')
+
+        def __init__(self, f, kind, checker, options):
+            from sphinx_typesafe.cache import LRUCache
             self.f = f
+            self.kind = kind  # None, classmethod or staticmethod
+            # whether the first argument of calls is the receiver, which is not specified,
+            # like when this function of a class is wrapped by classmethod
+            self.member = kind is None and checker.member and bool(checker.args) and \
+                (checker.entries is None or checker.args[0] not in dict(checker.entries))
+            if options['cache'] is not None and self.member:
+                # instances would be kept alive by keys and their state ignored
+                raise AttributeError('@typesafe: cache is not supported by instance methods: "{}"'.format(
+                    f.__name__))
+            self.outermost = options['outermost']  # whether only the outermost call is checked
+            self.cache = LRUCache(options['cache']) if options['cache'] is not None else None
+            # whether calls take the slow path, regardless of _slowpath
+            self.slow = self.outermost or self.cache is not None or checker.generic
             self.__name__ = self.f.__name__
-            self.__doc__ = self.f.__doc__
-            self.__dict__.update(self.f.__dict__)
             self.__checker = checker
+            # bound once, so that binding to a receiver only costs a MethodType. The function
+            # is copied under the name and docstring of the user's function, which bound
+            # methods report.
+            call = self.__method_call.__func__
+            call = types.FunctionType(call.__code__, call.__globals__, str(f.__name__),
+                                      call.__defaults__, call.__closure__)
+            call.__doc__ = f.__doc__
+            self.__bound = _MethodType(call, self)
+            _registry.add(self)
+
+        def __getattr__(self, name):
+            '''Attributes of the user's function are found without being copied.'''
+            if name == 'f': raise AttributeError(name)
+            return getattr(self.f, name)
 
         def __get__(self, instance, klass):
             '''A decorated class method is requested for being called later.
@@ -175,79 +1049,366 @@ class typesafe(object):
                   the Python runtime will call the wrapped function we return, whatever
                   case it is.
             '''
+            if self.__checker.inherit is not None:
+                self.__inherit(klass if klass is not None else type(instance))
+            kind = self.kind
+            if kind is staticmethod:
+                # Static methods are called like functions
+                return self
+            if kind is classmethod:
+                # Class methods receive the class
+                return _MethodType(self.__bound, klass if klass is not None else type(instance))
             if instance is None:
                 # Unbounded (not callable) class method was requested
                 return self.__method_unbound(klass)
             else:
-                # Callable instance method was requested
-                return self.__method_bound(instance, klass)
+                # Callable instance method was requested. The descriptor protocol
+                # guarantees that instance is an instance of klass: it is not checked.
+                return _MethodType(self.__bound, instance)
+
+        def compile(self):
+            '''Compiles the specification ahead of the first call, unless it is inherited.
+
+            Methods are told apart from functions by their first parameter, which
+            has no specification.
+            '''
+            checker = self.__checker
+            if checker.inherit is not None: return None
+            if self.kind is staticmethod:
+                ismethod = False
+            elif self.kind is classmethod:
+                ismethod = True
+            else:
+                ismethod = bool(checker.args) and checker.args[0] not in dict(checker.entries)
+            return checker.compiled[ismethod] or checker.compile(ismethod)
+
+        def cache_info(self):
+            '''Returns hits, misses, maximum and current size of the cache of results,
+            see option ``cache``.
+            '''
+            if self.cache is None:
+                raise AttributeError('@typesafe: results of "{}" are not cached'.format(self.__name__))
+            return self.cache.info()
+
+        def cache_clear(self):
+            '''Forgets results remembered and statistics, see option ``cache``.'''
+            if self.cache is None:
+                raise AttributeError('@typesafe: results of "{}" are not cached'.format(self.__name__))
+            self.cache.clear()
+
+        def __inherit(self, klass):
+            '''Adopts the specification of the method overridden by this one, which is
+            found in the MRO of ``klass``, after the class which defines this method.
+
+            When nothing can be adopted, the method is still bound and calls fail with a
+            TypeError, since ``hasattr`` and ``getattr`` would take an error raised here
+            for a missing attribute.
+            '''
+            import inspect
+            mro = inspect.getmro(klass)
+            name = self.__name__
+
+            def descriptor(cls):
+                # the class dictionary holds either a descriptor or a typesafe decorator
+                value = cls.__dict__.get(name)
+                return getattr(value, 'descriptor', value)
+            owners = [ i for i, cls in enumerate(mro) if descriptor(cls) is self ]
+            for cls in mro[owners[0] + 1:] if owners else ():
+                parent = descriptor(cls)
+                if isinstance(parent, type(self)):
+                    if parent.__checker.inherit is not None:
+                        parent.__inherit(cls)
+                    try:
+                        self.__checker.adopt(parent.__checker)
+                    except TypeError as e:
+                        self.__checker.inherit = '{}'.format(e)
+                        return
+                    self.slow = self.slow or self.__checker.generic
+                    return
 
         def __call__(self, *args, **kwargs):
             '''A decorated function was requested to be called.
             In other words, this method is called only for functions, not class methods.
 
-            This method returns a wrapper which contains the decorator logic for the
-            specific case of functions, not class methods.
+            This method contains the decorator logic for the specific case of functions,
+            not class methods.
             '''
-            def wrapper(*args, **kwargs):
-                #-- print('call')
-                #-- print('Called the decorated function {}'.format(self.f.__name__))
-                self.__checker.validate_params(self.f, False, *args, **kwargs)
-                result = self.f(*args, **kwargs)
-                self.__checker.validate_result(result)
-                return result
-            return wrapper(*args, **kwargs)
+            if self.member:
+                return self.__method_call(*args, **kwargs)
+            if _slowpath or self.slow:
+                return self.__invoke((), args, kwargs)
+            checker = self.__checker
+            spec = checker.compiled[False] or checker.compile(False)
+            checker.validate_params(spec, args, kwargs)
+            if spec.wrap is not None:
+                args, kwargs = checker.wrap_arguments(spec, args, kwargs)
+            result = self.f(*args, **kwargs)
+            checker.validate_result(spec, result)
+            if spec.rwrap:
+                result = checker.wrap_result(spec, result)
+            return result
+
+        def __invoke(self, receiver, args, kwargs):
+            '''Calls the decorated function or method on the slow path, which skips checks
+            when they are bypassed or when the function is already being called by the
+            current thread, with option ``outermost``.
+
+            ``receiver`` is either an empty tuple or a tuple holding the instance or class.
+            '''
+            if _slowpath and _bypass():
+                return self.f(*(receiver + tuple(args)), **kwargs)
+            if not (self.outermost or _defaults['outermost']):
+                return self.__checked(receiver, args, kwargs)
+            active = _active()
+            if self in active:
+                return self.f(*(receiver + tuple(args)), **kwargs)
+            active.add(self)
+            try:
+                return self.__checked(receiver, args, kwargs)
+            finally:
+                active.discard(self)
+
+        def __checked(self, receiver, args, kwargs):
+            '''Calls the decorated function or method on the slow path, with checks timed
+            when a profiler is installed, types recorded when an observer is installed and
+            callbacks of events ``before`` and ``after`` called, see: ``typesafe.hook``.
+            '''
+            f = self.f
+            for hook in _hooks['before']:
+                hook(self.__name__, args, kwargs)
+            profiler = _profiler
+            t0 = profiler.clock() if profiler is not None else None
+            checker = self.__checker
+            ismethod = bool(receiver)
+            spec = checker.compiled[ismethod] or checker.compile(ismethod)
+            checker.validate_params(spec, args, kwargs)
+            # types bound to type variables, in slots
+            bindings = checker.bind(spec, args, kwargs) if spec.typevars else None
+            cache = self.cache
+            if cache is not None:
+                # hits skip the body and the check of the result
+                key = receiver + checker.key(spec, args, kwargs)
+                result = cache.get(key, _missing)
+                if result is not _missing:
+                    if profiler is not None:
+                        profiler.record(self, profiler.clock() - t0, 0.0)
+                    for hook in _hooks['after']:
+                        hook(self.__name__, args, kwargs, result)
+                    return result
+            if spec.wrap is not None:
+                args, kwargs = checker.wrap_arguments(spec, args, kwargs)
+            t1 = profiler.clock() if profiler is not None else None
+            result = f(*(receiver + tuple(args)), **kwargs)
+            t2 = profiler.clock() if profiler is not None else None
+            checker.validate_result(spec, result)
+            if bindings is not None and spec.rgeneric:
+                checker.validate_generic_result(spec, result, bindings)
+            if spec.rwrap:
+                result = checker.wrap_result(spec, result)
+            if cache is not None:
+                cache.put(key, result)
+            if profiler is not None:
+                profiler.record(self, (t1 - t0) + (profiler.clock() - t2), t2 - t1)
+            if _observer is not None:
+                _observer.observe(self, checker.arguments(spec, args, kwargs), result)
+            for hook in _hooks['after']:
+                hook(self.__name__, args, kwargs, result)
+            return result
 
         def __method_unbound(self, klass):
             def wrapper(*args, **kwargs):
                 #-- print('unbounded')
                 raise TypeError('unbound method {}() must be called with {} instance '.format(
                     self.f.__name__, klass.__name__))
+            wrapper.__name__    = self.f.__name__
+            wrapper.__doc__     = self.f.__doc__
+            wrapper.__wrapped__ = self.f
             return wrapper
 
-        def __method_bound(self, instance, klass):
-            def wrapper(*args, **kwargs):
-                #-- print('bounded')
-                #-- print('Called the decorated method {} of {}'.format(self.f.__name__, instance))
-                self.__checker.check_type('self', instance, klass)
-                self.__checker.validate_params(self.f, True, *args, **kwargs)
-                result = self.f(instance, *args, **kwargs)
-                self.__checker.validate_result(result)
-                return result
-            # This instance does not need the descriptor anymore,
-            # let it find the wrapper directly next time:
-            setattr(instance, self.f.__name__, wrapper)
-            return wrapper
+        def __method_call(self, receiver, *args, **kwargs):
+            '''Contains the decorator logic for methods, bound to ``receiver``, which is
+            either an instance or a class.
+            '''
+            if _slowpath or self.slow:
+                return self.__invoke((receiver, ), args, kwargs)
+            checker = self.__checker
+            spec = checker.compiled[True] or checker.compile(True)
+            checker.validate_params(spec, args, kwargs)
+            if spec.wrap is not None:
+                args, kwargs = checker.wrap_arguments(spec, args, kwargs)
+            result = self.f(receiver, *args, **kwargs)
+            checker.validate_result(spec, result)
+            if spec.rwrap:
+                result = checker.wrap_result(spec, result)
+            return result
+
+    class __attribute(object):
+        '''Data descriptor which checks assignments of an instance attribute.
+
+        Values are stored into the slot of the attribute, when the class declares it
+        in ``__slots__``, or into the ``__dict__`` of the instance otherwise. The type
+        name is resolved on first assignment, which allows forward references.
+        '''
+        __slots__ = ('owner', 'name', 'spec', 'mode', 'storage', 'default', 'type', 'check')
+
+        def __init__(self, owner, name, spec, mode, storage, default):
+            self.owner   = owner    # name of the class
+            self.name    = name     # name of the attribute
+            self.spec    = spec     # type name, not resolved yet
+            self.mode    = mode
+            self.storage = storage  # member descriptor of the slot, or None
+            self.default = default  # class attribute replaced by this descriptor, if any
+            self.type    = None
+            self.check   = self.resolve
+
+        def resolve(self, value):
+            '''Resolves the type name and replaces itself by the actual predicate.'''
+            self.type  = get_class_type(self.spec)
+            self.check = predicate(self.type)
+            return self.check is None or self.check(value)
+
+        def __get__(self, instance, klass):
+            if instance is None:
+                # the class attribute replaced, if any, is still found in the class
+                return self.default if self.default is not _missing else self
+            if self.storage is not None:
+                return self.storage.__get__(instance, klass)
+            try:
+                return instance.__dict__[self.name]
+            except KeyError:
+                if self.default is not _missing: return self.default
+                raise AttributeError("'{}' object has no attribute '{}'".format(self.owner, self.name))
+
+        def __set__(self, instance, value):
+            check = self.check
+            if check is not None and not check(value) and not (_slowpath and _bypass()):
+                cls = self.type
+                actual = cls.actual(value) if isinstance(cls, (ContainerOf, CallableOf)) else type(value)
+                _fail(self.owner, self.mode, [ (self.name, cls, actual) ], [ (self.name, value) ])
+            if self.storage is not None:
+                self.storage.__set__(instance, value)
+            else:
+                instance.__dict__[self.name] = value
+
+        def __delete__(self, instance):
+            if self.storage is not None:
+                self.storage.__delete__(instance)
+            else:
+                try:
+                    del instance.__dict__[self.name]
+                except KeyError:
+                    raise AttributeError(self.name)
 
     class __checker(object):
         '''This class contains the type checking logic with is employed by
         decorator @typesafe.
         '''
 
-        import re
-        __types_re = re.compile(r":type[\s]+(\w+)[\s]*:[\s]*([\w\.]+)", re.IGNORECASE)
-        __rtype_re = re.compile(r":rtype[\s]*:[\s]*([\w\.]+)", re.IGNORECASE)
-        __error    = 'Wrong type for {}: expected: {}, actual: {}.'
         __internal = 'internal error: this condition should never happen'
 
-        def __init__(self, f, *args, **kwargs):
+        __slots__ = ('name', 'collect', 'mode', 'identity', 'wrap', 'entries', 'args', 'defaults', 'compiled',
+                     'inherit', 'cache', 'varargs', 'keywords', 'limit', 'generic', 'member')
+
+        class __compiled(object):
+            '''Specification of a decorated function, with type names already resolved.
+
+            Each formal parameter occupies a slot, which holds its name, its type and a
+            checker. A checker is a fast predicate, or None when the type is ignored.
+            Keyword arguments are mapped to their slots by name. Specified ``*args`` and
+            ``**kwargs`` occupy a slot each, holding the type of their values.
+            '''
+            __slots__ = ('names', 'slots', 'index', 'rtype', 'rcheck', 'required', 'wrap', 'rwrap',
+                         'vslot', 'kslot', 'positional', 'limit', 'typevars', 'generic', 'rgeneric')
+
+            def __init__(self, names, types, checkers, rtype, rcheck, required, wrap, rwrap,
+                         vslot, kslot, limit, typevars):
+                self.names    = names     # formal parameters, in order
+                self.slots    = tuple(_izip(names, types, checkers))
+                self.index    = dict( (name, i) for i, name in enumerate(names) )
+                self.rtype    = rtype     # type of the returned value
+                self.rcheck   = rcheck    # checker of the returned value
+                self.required = required  # number of parameters without default value
+                self.wrap     = wrap      # callable parameters to be wrapped, or None
+                self.rwrap    = rwrap     # whether the returned callable is to be wrapped
+                self.vslot    = vslot     # slot of specified *args, or None
+                self.kslot    = kslot     # slot of specified **kwargs, or None
+                # more positional arguments than this are checked by vslot
+                self.positional = len(names) if vslot is not None else sys.maxsize
+                self.limit    = limit     # number of variadic values checked per call, or None
+                self.typevars = typevars  # number of type variables, bound in slots per call
+                # parameters whose types employ type variables, checked by bind
+                self.generic  = tuple( (i, name, t) for i, (name, t) in enumerate(_izip(names, types))
+                                       if _generic(t) )
+                self.rgeneric = _generic(rtype)
+
+        def __init__(self, f, options, member, *args, **kwargs):
+            import inspect
+            self.name     = f.__name__
+            self.member   = member  # whether the first parameter may be a receiver
+            self.collect  = options['collect']
+            self.mode     = options['mode']
+            self.identity = options['identity_cache']
+            self.wrap     = options['wrap_callables']
+            self.cache    = options['cache']
             if len(args) == 0:
-                self.types = self.inspect_function(f)
+                self.entries = self.inspect_function(f)
+            else:
+                self.entries = self.parse_params(*args, **kwargs)
+            argspec = inspect.getargspec(f)
+            self.args     = tuple(argspec.args)
+            self.defaults = argspec.defaults if argspec.defaults is not None else ()
+            self.varargs  = argspec.varargs   # name of *args, or None
+            self.keywords = argspec.keywords  # name of **kwargs, or None
+            self.limit    = options['variadic_limit']
+            # Type names are resolved only once, for functions and methods respectively
+            self.compiled = [ None, None ]
+            # Methods without specification inherit it, see: adopt
+            self.inherit  = None
+            # whether types employ type variables, whose calls take the slow path
+            self.generic  = any( _typevar_re.search(t) for name, t in self.entries )
+            unspecified = len(args) == 0 and self.entries == (('return', 'types.NoneType'), )
+            if options['inherit']:
+                if not unspecified:
+                    raise AttributeError('@typesafe: cannot inherit and specify "{}" at once'.format(self.name))
+                self.inherit = 'no specification to inherit for "{}"'.format(self.name)
+                self.entries = None
+            elif unspecified and self.member and self.args[1:]:
+                try:
+                    self.validate_spec()
+                except AttributeError as e:
+                    # it may be an overriding method, which is only known when bound
+                    self.inherit = '{}'.format(e)
+                    self.entries = None
             else:
-                self.types = self.parse_params(*args, **kwargs)
+                self.validate_spec()
+            if self.cache is not None and self.entries is not None:
+                unhashable = self.unhashable(self.entries)
+                if unhashable:
+                    raise AttributeError('@typesafe: cache requires hashable arguments: "{}"'.format(unhashable))
+
+        def adopt(self, parent):
+            """Adopts the specification of ``parent``, the checker of an overridden method.
+
+            The compiled specification is shared by reference whenever signatures and
+            options are the same, so that it is resolved and stored only once.
+            """
+            if parent.entries is None:
+                raise TypeError(parent.inherit)
+            if (self.args[1:], self.varargs, self.keywords) != (parent.args[1:], parent.varargs, parent.keywords):
+                raise TypeError('cannot inherit specification of "{}": parameters differ'.format(self.name))
+            self.entries = parent.entries
+            self.generic = parent.generic
+            if (self.defaults, self.identity, self.wrap, self.limit, self.cache) == \
+               (parent.defaults, parent.identity, parent.wrap, parent.limit, parent.cache):
+                self.compiled = parent.compiled
+            self.inherit = None
 
         def inspect_function(self, func):
             """Obtain argument types of a decorated function by instrospecting its Sphinx docstring.""" 
             import inspect
             # the parameter spec is defined as docstring.
-            doc = inspect.getdoc(func)
-            if doc is None: doc = ''
-            entries = self.__types_re.findall(doc)
-            try:
-                entries.append( (str('return'), self.__rtype_re.search(doc).group(1)) )
-            except:
-                entries.append( (str('return'), 'types.NoneType') )
-            return self.convert_entries_to_types(entries)
+            entries = parse_docstring(inspect.getdoc(func))
+            return self.normalize_entries(entries)
 
         def parse_params(self, *args, **kwargs):
             import sys
@@ -256,76 +1417,376 @@ class typesafe(object):
             else:
                 return self.parse_params3(*args, **kwargs)
 
-        def validate_params(self, func, ismethod, *args, **kwargs):
-            """Validate formal parameters before calling a decorated function."""
-            import inspect
-            from itertools import chain
-
-            # obtain function specification
-            argspec = inspect.getargspec(func)
-            spec     = argspec.args[1:] if ismethod else argspec.args
-            defaults = argspec.defaults if argspec.defaults is not None else ()
-
-            # check argument against specification
-            names = list()
-            for name, arg in chain(zip(spec, args), kwargs.items()):
-                if name in self.types:
-                    names.append(name)
-                    self.check_type(name, arg, self.types[name])
-                else:
-                    raise AttributeError('specification of variable "{}" is expected.'.format(name))
+        def validate_spec(self):
+            """Verify the specification against the signature of the decorated function.
+
+            The first argument of a function defined in a class is not verified here,
+            since only binding tells whether it is the receiver of a method or an
+            ordinary argument.
+            """
+            names = [ name for name, t in self.entries ]
+            extra = [ name for name in names
+                      if name not in self.args and name not in (self.varargs, self.keywords, 'return') ]
+            if len(extra) > 0:
+                raise AttributeError('extra specification(s) detected: "{}"'.format(extra))
+            missing = [ name for name in (self.args[1:] if self.member else self.args) if name not in names ]
+            if len(missing) > 0:
+                raise AttributeError('missing argument(s) expected: "{}"'.format(missing))
+
+        def unhashable(self, entries):
+            """Returns names of arguments specified by built-in types which cannot be hashed,
+            like ``list of int``, before type names are resolved. Other types are verified
+            when compiled.
+            """
+            import importlib
+            builtins = importlib.import_module('__builtin__')
+            result = list()
+            for name, t in entries:
+                if name == 'return': continue
+                t = ' '.join(t.split())
+                if name in (self.varargs, self.keywords):
+                    # values of *args and **kwargs are keys, not their container
+                    t = t.partition(' of ')[2]
+                for part in t.split(' of '):
+                    cls = getattr(builtins, part.strip(), None)
+                    if isinstance(cls, type) and cls.__hash__ is None:
+                        result.append(name)
+                        break
+            return result
+
+        def compile(self, ismethod):
+            """Resolve type names and verify default values, once for each kind of call."""
+            import types
+            if self.entries is None:
+                # nothing was inherited, either since it was not bound as a method or since
+                # the overridden method has no specification
+                raise TypeError(self.inherit)
+            if self.args:
+                first = self.args[0]
+                names = [ name for name, t in self.entries ]
+                if ismethod and first in names:
+                    raise AttributeError('extra specification(s) detected: "{}"'.format([ first ]))
+            names = tuple(self.args[1:] if ismethod else self.args)
+            resolved = self.convert_entries_to_types(self.entries)
+            if not ismethod and self.args and first not in resolved:
+                # a method called as a function, whose receiver is not passed apart
+                raise AttributeError('missing argument(s) expected: "{}"'.format([ first ]))
+            typevars = self.typevars(resolved.values())
 
             # check default arguments, if any
-            rnames = [ item for item in chain(spec, kwargs.keys()) if item not in set(names) ]
-            dnames = list()
-            index = 0; dlen = -1 * len(defaults)
-            for name in rnames[::-1]:
-                index -= 1
-                if name in self.types:
-                    if index >= dlen:
-                        dnames.append(name)
-                        self.check_type(name, defaults[index], self.types[name])
+            violations = list()
+            dnames = names[max(0, len(names) - len(self.defaults)):]
+            defaults = list(zip(dnames, self.defaults[len(self.defaults) - len(dnames):]))
+            for name, default in defaults:
+                violation = self.violation(name, default, resolved[name])
+                if violation is not None:
+                    violations.append(violation)
+            if violations:
+                self.fail(violations if self.collect else violations[:1], defaults)
+
+            ptypes = tuple( resolved[name] for name in names )
+            rtype  = resolved.get('return', types.NoneType)
+            vslot = self.variadic(self.varargs, tuple, resolved)
+            kslot = self.variadic(self.keywords, dict, resolved)
+            if self.cache is not None:
+                # arguments are keys of the cache of results
+                unhashable = [ name for name, t in zip(names, ptypes) if not _hashable(t) ] + \
+                             [ slot[0] for slot in (vslot, kslot) if slot is not None and not _hashable(slot[1]) ]
+                if unhashable:
+                    raise AttributeError('@typesafe: cache requires hashable arguments: "{}"'.format(unhashable))
+            wrap = tuple( (i, name, t) for i, (name, t) in enumerate(zip(names, ptypes))
+                          if self.wrap and isinstance(t, CallableOf) and t.checked ) or None
+            rwrap = self.wrap and isinstance(rtype, CallableOf) and rtype.checked
+            # types employing type variables are checked by bind, not by predicates
+            spec = self.__compiled(names, ptypes,
+                                   tuple( None if _generic(t) else self.predicate(t) for t in ptypes ),
+                                   rtype, None if _generic(rtype) else self.predicate(rtype),
+                                   len(names) - len(dnames), wrap, rwrap, vslot, kslot, self.limit, typevars)
+            self.compiled[ismethod] = spec
+            for hook in _hooks['compile']:
+                hook(self.name, list(zip(names, ptypes)) + [ ('return', rtype) ])
+            return spec
+
+        def typevars(self, types):
+            """Assigns a slot to each type variable found in ``types``, by name, and returns
+            the number of slots. A bound given by any occurrence applies to all of them.
+            """
+            found, containers = list(), list()
+            for t in types:
+                while isinstance(t, ContainerOf):
+                    containers.append(t)
+                    t = t.element
+                if isinstance(t, TypeVar): found.append(t)
+            slots, bounds = dict(), dict()
+            for t in found:
+                t.index = slots.setdefault(t.name, len(slots))
+                if t.bound is not None:
+                    if bounds.setdefault(t.name, t.bound) != t.bound:
+                        raise AttributeError('@typesafe: conflicting bounds of type variable "{}"'.format(t.name))
+            for t in found:
+                t.bound = bounds.get(t.name)
+            for t in reversed(containers):
+                t.check = predicate(t.element)
+            return len(slots)
+
+        def variadic(self, name, container, resolved):
+            """Returns the slot of ``*args`` or ``**kwargs``, given by ``name``, holding the type
+            of their values, or None when not specified. ``container`` is either ``tuple``
+            or ``dict``, which may be specified alone, meaning values of any type.
+            """
+            import types
+            if name is None or name not in resolved: return None
+            cls = resolved[name]
+            if cls is container:
+                cls = types.NotImplementedType
+            elif isinstance(cls, ContainerOf) and cls.container is container:
+                cls = cls.element
+            else:
+                raise AttributeError('@typesafe: "{}" must be specified as "{} of T"'.format(
+                    name, container.__name__))
+            return (name, cls, self.predicate(cls))
+
+        def validate_params(self, spec, args, kwargs):
+            """Validate actual parameters before calling a decorated function.
+
+            Default values were already verified when the specification was
+            compiled, so only arguments actually passed are checked here.
+            """
+            violations = None
+            for (name, cls, check), arg in _izip(spec.slots, args):
+                if check is not None and not check(arg):
+                    violation = self.violation(name, arg, cls)
+                    if violation is not None:
+                        if not self.collect:
+                            self.fail([ violation ], self.arguments(spec, args, kwargs))
+                        else:
+                            if violations is None: violations = list()
+                            violations.append(violation)
+            if len(args) > spec.positional:
+                violations = self.validate_varargs(spec, args, kwargs, violations)
+            if kwargs:
+                slots = spec.slots
+                index = spec.index
+                kslot = spec.kslot
+                checked = 0
+                for name in kwargs:
+                    i = index.get(name)
+                    if i is not None:
+                        name, cls, check = slots[i]
+                    elif kslot is not None:
+                        # values of **kwargs are reported by keyword
+                        cls, check = kslot[1], kslot[2]
+                        checked += 1
+                        if spec.limit is not None and checked > spec.limit: continue
                     else:
-                        break
+                        raise AttributeError('specification of variable "{}" is expected.'.format(name))
+                    arg = kwargs[name]
+                    if check is not None and not check(arg):
+                        violation = self.violation(name, arg, cls)
+                        if violation is not None:
+                            if not self.collect:
+                                self.fail([ violation ], self.arguments(spec, args, kwargs))
+                            else:
+                                if violations is None: violations = list()
+                                violations.append(violation)
+            if violations:
+                self.fail(violations, self.arguments(spec, args, kwargs))
 
             # check missing arguments
-            mnames = [ item for item in rnames
-                       if item not in set(dnames) ]
-            if len(mnames) > 0:
-                raise AttributeError('missing argument(s) expected: "{}"'.format(mnames))
-
-            # check extra arguments
-            rnames = [ item for item in self.types.keys()
-                       if item not in set(spec) and item != 'return' ]
-            if len(rnames) > 0:
-                raise AttributeError('extra specification(s) detected: "{}"'.format(rnames))
-
-        def validate_result(self, result):
+            if len(args) < spec.required:
+                missing = [ name for name in spec.names[len(args):spec.required]
+                            if name not in kwargs ]
+                if len(missing) > 0:
+                    raise AttributeError('missing argument(s) expected: "{}"'.format(missing))
+
+        def validate_varargs(self, spec, args, kwargs, violations):
+            """Validate values of ``*args`` in a tight loop, no more than ``limit`` of them.
+            Returns violations collected so far.
+            """
+            name, cls, check = spec.vslot
+            if check is None: return violations
+            start = spec.positional
+            stop = len(args) if spec.limit is None else min(len(args), start + spec.limit)
+            # builtin predicates are mapped without a Python frame per value
+            if all(_imap(check, args[start:stop])): return violations
+            for i in range(start, stop):
+                arg = args[i]
+                if not check(arg):
+                    violation = self.violation('{}[{}]'.format(name, i - start), arg, cls)
+                    if violation is not None:
+                        if not self.collect:
+                            self.fail([ violation ], self.arguments(spec, args, kwargs))
+                        else:
+                            if violations is None: violations = list()
+                            violations.append(violation)
+            return violations
+
+        def bind(self, spec, args, kwargs):
+            """Binds type variables to the types of the first values matched against them,
+            in order of parameters, and checks further values against types bound.
+            Returns the list of types bound, one per type variable.
+            """
+            bindings = [ None ] * spec.typevars
+            violations = list()
+            offset = len(spec.names) - len(self.defaults)
+            for i, name, cls in spec.generic:
+                if i < len(args):
+                    value = args[i]
+                elif name in kwargs:
+                    value = kwargs[name]
+                elif i >= offset:
+                    value = self.defaults[i - offset]
+                else:
+                    continue
+                violations.append(self.match(name, value, cls, bindings))
+            if spec.vslot is not None and _generic(spec.vslot[1]):
+                name, cls, check = spec.vslot
+                for i in range(spec.positional, len(args)):
+                    violations.append(self.match('{}[{}]'.format(name, i - spec.positional), args[i], cls, bindings))
+            if spec.kslot is not None and _generic(spec.kslot[1]):
+                cls = spec.kslot[1]
+                for name in kwargs:
+                    if name not in spec.index:
+                        violations.append(self.match(name, kwargs[name], cls, bindings))
+            violations = [ v for v in violations if v is not None ]
+            if violations:
+                self.fail(violations if self.collect else violations[:1], self.arguments(spec, args, kwargs))
+            return bindings
+
+        def match(self, name, value, cls, bindings):
+            """Matches ``value`` against ``cls``, a type variable or a container of type variables,
+            binding type variables not bound yet. Returns a violation, or None.
+            """
+            if isinstance(cls, TypeVar):
+                bound = bindings[cls.index]
+                if bound is not None:
+                    return None if isinstance(value, bound) else (name, bound, type(value))
+                if cls.bound is not None and not isinstance(value, cls.bound):
+                    return (name, cls, type(value))
+                bindings[cls.index] = type(value)
+                return None
+            if not isinstance(value, cls.container):
+                return (name, cls, type(value))
+            for item in (value.itervalues() if isinstance(value, dict) else value):
+                violation = self.match(name, item, cls.element, bindings)
+                if violation is not None:
+                    return (name, ContainerOf(cls.container, violation[1]), ContainerOf(type(value), violation[2]))
+            return None
+
+        def validate_generic_result(self, spec, result, bindings):
+            """Validate returned value of a decorated function against types bound in the call."""
+            violation = self.match('return', result, spec.rtype, bindings)
+            if violation is not None:
+                self.fail([ violation ], [ ('return', result) ])
+
+        def validate_result(self, spec, result):
             """Validate returned value of a decorated function."""
-            if 'return' in self.types:
-                self.check_type('return', result, self.types['return'])
-            else:
-                self.check_type('return', result, None)
+            check = spec.rcheck
+            if check is not None and not check(result):
+                self.check_type('return', result, spec.rtype)
+
+        def wrap_arguments(self, spec, args, kwargs):
+            """Replaces callables passed as arguments by wrappers which check their own calls."""
+            if not _defaults['wrap_callables']: return args, kwargs
+            args = list(args)
+            for i, name, cls in spec.wrap:
+                if i < len(args):
+                    args[i] = self.wrap_callable(name, cls, args[i])
+                elif name in kwargs:
+                    kwargs[name] = self.wrap_callable(name, cls, kwargs[name])
+            return args, kwargs
+
+        def wrap_result(self, spec, result):
+            """Replaces a callable returned by a wrapper which checks its own calls."""
+            if not _defaults['wrap_callables']: return result
+            return self.wrap_callable('return', spec.rtype, result)
+
+        def wrap_callable(self, name, cls, fn):
+            """Returns a wrapper of callable ``fn``, which checks arguments and result
+            against ``cls``, an instance of ``CallableOf``.
+            """
+            if not callable(fn): return fn
+            slots = tuple(_izip(cls.args, cls.checks)) if cls.args is not None else ()
+            rtype, rcheck = cls.result, cls.rcheck
+            checker = self
+
+            def wrapper(*args, **kwargs):
+                for i, ((t, check), arg) in enumerate(_izip(slots, args)):
+                    if check is not None and not check(arg):
+                        checker.check_type('argument {} of {}'.format(i, name), arg, t)
+                result = fn(*args, **kwargs)
+                if rcheck is not None and not rcheck(result):
+                    checker.check_type('result of {}'.format(name), result, rtype)
+                return result
+            wrapper.__name__ = getattr(fn, '__name__', wrapper.__name__)
+            wrapper.__doc__  = getattr(fn, '__doc__', None)
+            return wrapper
+
+        def predicate(self, cls):
+            """Returns a fast predicate which accepts instances of ``cls``, or None if ``cls`` is ignored.
+
+            Objects rejected by the predicate are not necessarily wrong: classes
+            are verified against ``cls`` by method ``violation``.
+            """
+            check = predicate(cls)
+            if self.identity and isinstance(cls, ContainerOf):
+                from sphinx_typesafe.identity import identity
+                check = identity.remember(check)
+            return check
 
         def check_type(self, name, obj, cls):
-            # return silently if either obj or cls is None
-            if obj is None and cls is None: return
-            import types
-            # return silently if type is marked to be ignored
-            if cls == types.NotImplementedType: return
-            # perform type checking
-            from zope.interface.verify import verifyObject
-            if obj is type or isinstance(obj, ( types.TypeType, 
-                                                types.ClassType, 
-                                                types.FunctionType )):
-                # print('Check argument {} type {} against {}'.format(name, obj, cls))
-                if not issubclass(obj, cls):
-                    if not 'providedBy' in cls or not verifyObject(cls, obj):
-                        raise TypeError(self.__error.format(name, cls, obj))
-            else:
-                # print('Check argument {} type {} against {}'.format(name, type(obj), cls))
-                if not isinstance(obj, cls):
-                    raise TypeError(self.__error.format(name, cls, type(obj)))
+            violation = self.violation(name, obj, cls)
+            if violation is not None:
+                self.fail([ violation ], [ (name, obj) ])
+
+        def key(self, spec, args, kwargs):
+            """Returns values of all parameters of a call, in order, including default values,
+            so that equivalent calls are keyed alike in the cache of results.
+            """
+            names = spec.names
+            if not kwargs:
+                # parameters not passed take their default values, already verified
+                return tuple(args) + self.defaults[len(self.defaults) - (len(names) - len(args)):]
+            values = list(args) + [ _missing ] * (len(names) - len(args))
+            keywords = list()
+            for name, value in kwargs.items():
+                i = spec.index.get(name)
+                if i is None:
+                    keywords.append( (name, value) )
+                else:
+                    values[i] = value
+            offset = len(names) - len(self.defaults)
+            for i in range(max(offset, len(args)), len(names)):
+                if values[i] is _missing: values[i] = self.defaults[i - offset]
+            # values of **kwargs follow, in order of keywords
+            return tuple(values) + tuple(sorted(keywords))
+
+        def arguments(self, spec, args, kwargs):
+            """Returns actual parameters of a call as ``(name, value)`` pairs."""
+            extra = len(args) > len(spec.names) and self.varargs is not None
+            varargs = [ (self.varargs, tuple(args[len(spec.names):])) ] if extra else []
+            return list(_izip(spec.names, args)) + varargs + list(kwargs.items())
+
+        def fail(self, violations, arguments):
+            """Either raise ``TypeCheckError`` or report violations and proceed, see: ``_fail``."""
+            _fail(self.name, self.mode, violations, arguments)
+
+        def violation(self, name, obj, cls):
+            """Returns a tuple ``(name, expected, actual)`` describing a type mismatch, or None."""
+            return violation(name, obj, cls)
+
+        def normalize_entries(self, entries):
+            """Verify and normalize names of parameters and types, without resolving types.
+
+            Returns a compact tuple of ``(name, type)`` pairs, in order, without duplicates.
+            """
+            import collections
+            result = collections.OrderedDict()
+            for name, t in entries:
+                atype = get_unicode(t)
+                name  = name.strip()
+                result[name] = atype
+            return tuple(result.items())
 
         def convert_entries_to_types(self, types):
             # print('types: ', types)
@@ -350,7 +1811,7 @@ class typesafe(object):
             if len(args) != 1 or kwargs:
                 raise AttributeError('@typesafe: illegal number of parameters')
             if isinstance(args[0], dict):
-                return self.convert_entries_to_types(args[0].items())
+                return self.normalize_entries(args[0].items())
             else:
                 raise AttributeError('@typesafe: parameter must be a dictionary')
 